@@ -14,15 +14,24 @@ from .message import extract_plain_text as extract_plain_text
 from .utils import get_path as get_path
 from .utils import load_data as load_data
 from .utils import is_file_path as is_file_path
+from .utils import classify_paths as classify_paths
+from .utils import aclassify_paths as aclassify_paths
 from .utils import awaitable as awaitable
+from .utils import blocking as blocking
+from .utils import background_loop as background_loop
+
+from .diagnostics import timed as timed
 
 from .requests import Requests as Requests
 
+from .config import Config
+
 __plugin_meta__ = PluginMetadata(
     name="聚能环",
     description="NoneBot 外置电池",
     usage="详见文档",
     type="library",
     homepage="https://github.com/KomoriDev/nonebot-plugin-ability",
+    config=Config,
     supported_adapters=inherit_supported_adapters("nonebot_plugin_alconna"),
 )
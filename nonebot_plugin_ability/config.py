@@ -0,0 +1,45 @@
+import nonebot
+
+from pathlib import Path
+from pydantic import BaseModel
+
+
+class Config(BaseModel):
+    """聚能环配置"""
+
+    ability_max_bytes: int | None = None
+    """响应体的全局最大字节数，`None` 为不限制"""
+    ability_spool_size: int = 1024 * 1024
+    """下载时超过该字节数的响应体写入临时文件"""
+    ability_max_connections: int = 100
+    """同时进行的最大请求数"""
+    ability_priority_reserve: float = 0.2
+    """每个优先级为更高优先级保留的请求额度比例"""
+    ability_hedge_percentile: float = 0.95
+    """对冲请求在主机延迟达到该分位数后发出"""
+    ability_hedge_delay: float = 1.0
+    """主机延迟样本不足时的对冲等待时间，单位：秒"""
+    ability_adaptive_timeout: bool = False
+    """未指定超时时间时，是否根据主机的 p99 延迟自动调整超时时间"""
+    ability_cache_path: Path | None = None
+    """持久化响应缓存的 SQLite 数据库路径，`None` 为不启用"""
+    ability_cache_max_size: int = 256 * 1024 * 1024
+    """持久化响应缓存的最大字节数"""
+    ability_cache_compact_interval: float = 3600
+    """持久化响应缓存的整理间隔，单位：秒"""
+    ability_loop_monitor: bool = False
+    """是否在启动时监视事件循环阻塞"""
+    ability_loop_lag_threshold: float = 0.5
+    """事件循环停顿超过该时间时输出阻塞位置，单位：秒"""
+    ability_dns_ttl: float = 300
+    """会话的 DNS 解析缓存时间，单位：秒"""
+    ability_session_cookie_dir: Path | None = None
+    """会话 Cookie 的保存目录，`None` 为不保存"""
+    ability_prewarm_hosts: list[str] = []
+    """启动时为 `Requests.get` 等方法预热连接的主机地址，如 `https://example.com`"""
+
+
+try:
+    plugin_config = nonebot.get_plugin_config(Config)
+except AttributeError:
+    plugin_config = Config.parse_obj(nonebot.get_driver().config)
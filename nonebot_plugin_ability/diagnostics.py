@@ -0,0 +1,165 @@
+import sys
+import time
+import asyncio
+import inspect
+import threading
+import traceback
+
+from nonebot import get_driver
+from functools import wraps
+from collections import deque
+from nonebot.log import logger
+from typing import Any, Callable
+
+from .utils import P, R
+from .config import plugin_config
+from .requests.stats import LatencyTracker
+
+timings: dict[str, list[float]] = {}
+"""被 `timed` 装饰的函数的调用次数、总耗时与最大耗时"""
+
+
+def timed(func: Callable[P, R]) -> Callable[P, R]:
+    """
+    函数耗时统计装饰器
+    同步函数的耗时即阻塞事件循环的时间；协程函数统计的是包含等待在内的总耗时。
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+    timing = timings.setdefault(name, [0, 0.0, 0.0])
+
+    def record(elapsed: float) -> None:
+        timing[0] += 1
+        timing[1] += elapsed
+        timing[2] = max(timing[2], elapsed)
+
+    if inspect.iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                record(time.perf_counter() - start)
+
+        return async_wrapper  # type: ignore
+
+    @wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(time.perf_counter() - start)
+
+    return wrapper
+
+
+def hot_functions(limit: int = 10) -> list[tuple[str, int, float, float]]:
+    """
+    获取总耗时最多的函数
+    :param limit: 返回的数量
+    :return: 函数名、调用次数、总耗时、最大耗时，单位：秒
+    """
+    ranked = sorted(timings.items(), key=lambda item: item[1][1], reverse=True)
+    return [
+        (name, int(count), total, maximum)
+        for name, (count, total, maximum) in ranked[:limit]
+        if count
+    ]
+
+
+class LoopMonitor:
+    """
+    事件循环延迟监视器
+
+    在事件循环中运行心跳任务测量调度延迟；另起一个守护线程检查心跳，
+    事件循环停顿超过 `threshold` 时记录并输出阻塞位置的调用栈。
+
+    :param interval: 心跳间隔，单位：秒
+    :param threshold: 判定为阻塞的停顿时间，单位：秒
+    """
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.5) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.lag = LatencyTracker()
+        """事件循环的调度延迟"""
+        self.stalls: deque[str] = deque(maxlen=20)
+        """最近捕获的阻塞调用栈"""
+        self._beat = time.monotonic()
+        self._reported = 0.0
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._loop_thread_id = 0
+
+    def start(self) -> None:
+        """在当前事件循环中启动监视"""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(
+            target=self._watch, name="ability-loop-monitor", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self) -> None:
+        """停止监视"""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join)
+            self._thread = None
+
+    def stats(self) -> dict[str, float]:
+        """
+        获取事件循环延迟统计
+        :return: 样本数与 p50、p90、p99 延迟，单位：秒
+        """
+        return self.lag.summary().get("loop", {"count": 0})
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            self._beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self.lag.record("loop", max(loop.time() - start - self.interval, 0))
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            beat = self._beat
+            stalled = time.monotonic() - beat
+            if stalled < self.threshold or beat == self._reported:
+                continue
+            self._reported = beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            self.stalls.append(stack)
+            logger.warning(f"事件循环已阻塞 {stalled:.3f} 秒，当前调用栈:\n{stack}")
+
+
+loop_monitor = LoopMonitor(threshold=plugin_config.ability_loop_lag_threshold)
+"""全局事件循环监视器，配置 `ability_loop_monitor` 后随驱动器启动"""
+
+driver = get_driver()
+
+
+@driver.on_startup
+async def _start_loop_monitor() -> None:
+    if plugin_config.ability_loop_monitor:
+        loop_monitor.start()
+
+
+@driver.on_shutdown
+async def _stop_loop_monitor() -> None:
+    await loop_monitor.stop()
@@ -1,6 +1,11 @@
 import httpx
+import sqlite3
+import weakref
+import asyncio
 import nonebot
+import tempfile
 
+from nonebot.log import logger
 from httpx import Response
 from httpx._types import (
     CookieTypes,
@@ -15,14 +20,44 @@ from httpx._types import (
     VerifyTypes,
 )
 
-from typing import Any, Literal
+from pathlib import Path
+from time import perf_counter
+from collections.abc import Iterable, Hashable
+from functools import partial
+from typing import IO, Any, Literal, overload
 
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
-from .utils import add_user_agent
+from ..config import plugin_config
+from .utils import (
+    T,
+    hedged,
+    Compression,
+    decode_json,
+    read_limited,
+    aiter_limited,
+    proxy_mounts,
+    add_user_agent,
+    compress_request,
+)
+from .stream import SSEDecoder, NDJSONDecoder, ServerSentEvent
+from .stats import LatencyTracker
+from .session import DNSCache, SessionPool, close_clients
+from .cache import CacheEntry, SQLiteCache, cache_key
+from .scheduler import Priority, PriorityScheduler
+
+driver = nonebot.get_driver()
+config = driver.config
 
-config = nonebot.get_driver().config
+HEDGE_METHODS = ("GET", "HEAD", "OPTIONS")
+"""允许对冲的请求方法"""
+HEDGE_MIN_SAMPLES = 20
+"""使用主机延迟统计前需要的最少样本数"""
+ADAPTIVE_TIMEOUT_MIN = 1.0
+"""自适应超时的下限，单位: 秒"""
+ADAPTIVE_TIMEOUT_FACTOR = 4
+"""自适应超时相对于主机 p99 延迟的倍数"""
 
 
 class Requests:
@@ -30,6 +65,37 @@ class Requests:
     httpx 异步请求封装
     """
 
+    scheduler = PriorityScheduler(
+        plugin_config.ability_max_connections,
+        plugin_config.ability_priority_reserve,
+    )
+    """请求优先级调度器"""
+    host_latency = LatencyTracker()
+    """各主机的请求延迟"""
+    cache: SQLiteCache | None = (
+        SQLiteCache(
+            plugin_config.ability_cache_path, plugin_config.ability_cache_max_size
+        )
+        if plugin_config.ability_cache_path is not None
+        else None
+    )
+    """持久化响应缓存，配置 `ability_cache_path` 后启用"""
+    transport: httpx.AsyncBaseTransport | None = None
+    """未指定 `transport` 参数时使用的默认传输层，如 `ReplayTransport`"""
+    _transports: weakref.WeakKeyDictionary[
+        asyncio.AbstractEventLoop,
+        dict[
+            Hashable,
+            tuple[httpx.AsyncBaseTransport, dict[str, httpx.AsyncBaseTransport | None]],
+        ],
+    ] = weakref.WeakKeyDictionary()
+    """各事件循环中复用的传输层及代理挂载"""
+    sessions = SessionPool(
+        DNSCache(plugin_config.ability_dns_ttl),
+        plugin_config.ability_session_cookie_dir,
+    )
+    """命名的长期会话"""
+
     @classmethod
     async def get(
         cls,
@@ -43,6 +109,11 @@ class Requests:
         verify: VerifyTypes = True,
         http2: bool = False,
         proxies: ProxiesTypes | None = None,
+        max_bytes: int | None = None,
+        priority: Priority = "normal",
+        hedge: bool = False,
+        mirror: URLTypes | None = None,
+        cache: bool = True,
         **kwargs,
     ) -> Response:
         """
@@ -56,25 +127,34 @@ class Requests:
         :param verify: 是否显示 SSL 整数
         :param http2: 是否使用 HTTP/2
         :param proxies: 代理地址
+        :param max_bytes: 响应体最大字节数，默认使用 `ability_max_bytes` 配置
+        :param priority: 请求优先级，`high` 用于交互请求，`low` 用于后台批量任务
+        :param hedge: 是否启用对冲请求
+        :param mirror: 对冲请求使用的镜像地址，默认与 `url` 相同
+        :param cache: 是否使用 `Requests.cache` 缓存 GET 响应，携带 Cookie 或认证信息的请求不使用缓存
         :param kwargs: 传递给 `httpx.AsyncClient` 的其他参数
 
         :return: `httpx.Response` 对象
         """
 
-        async with httpx.AsyncClient(
+        return await cls.request(
+            "GET",
+            url,
+            params=params,
+            headers=headers,
+            cookies=cookies,
+            follow_redirects=follow_redirects,
+            timeout=timeout,
             verify=verify,
             http2=http2,
-            proxies=proxies or config.proxy_url,  # type: ignore
+            proxies=proxies,
+            max_bytes=max_bytes,
+            priority=priority,
+            hedge=hedge,
+            mirror=mirror,
+            cache=cache,
             **kwargs,
-        ) as client:
-            return await client.get(
-                url,
-                params=params,
-                headers=add_user_agent(headers),
-                cookies=cookies,
-                follow_redirects=follow_redirects,
-                timeout=timeout if timeout is not None else config.http_timeout,
-            )
+        )
 
     @classmethod
     async def post(
@@ -93,6 +173,9 @@ class Requests:
         verify: VerifyTypes = True,
         http2: bool = False,
         proxies: ProxiesTypes | None = None,
+        max_bytes: int | None = None,
+        priority: Priority = "normal",
+        compress: Compression | None = None,
         **kwargs,
     ) -> Response:
         """
@@ -110,28 +193,33 @@ class Requests:
         :param verify: 是否验证 SSL 证书
         :param http2: 是否使用 HTTP/2
         :param proxies: 代理地址
+        :param max_bytes: 响应体最大字节数，默认使用 `ability_max_bytes` 配置
+        :param priority: 请求优先级，`high` 用于交互请求，`low` 用于后台批量任务
+        :param compress: 压缩请求体使用的格式，默认不压缩
         :param kwargs: 传递给 `httpx.AsyncClient` 的其他参数
 
         :return:`httpx.Response` 对象
         """
-        async with httpx.AsyncClient(
+        return await cls.request(
+            "POST",
+            url,
+            content=content,
+            data=data,
+            files=files,
+            json=json,
+            params=params,
+            headers=headers,
+            cookies=cookies,
+            follow_redirects=follow_redirects,
+            timeout=timeout,
             verify=verify,
             http2=http2,
-            proxies=proxies or config.proxy_url,  # type: ignore
+            proxies=proxies,
+            max_bytes=max_bytes,
+            priority=priority,
+            compress=compress,
             **kwargs,
-        ) as client:
-            return await client.post(
-                url,
-                content=content,
-                data=data,
-                files=files,
-                json=json,
-                params=params,
-                headers=add_user_agent(headers),
-                cookies=cookies,
-                follow_redirects=follow_redirects,
-                timeout=timeout if timeout is not None else config.http_timeout,
-            )
+        )
 
     @classmethod
     async def put(
@@ -150,6 +238,9 @@ class Requests:
         verify: VerifyTypes = True,
         http2: bool = False,
         proxies: ProxiesTypes | None = None,
+        max_bytes: int | None = None,
+        priority: Priority = "normal",
+        compress: Compression | None = None,
         **kwargs,
     ) -> Response:
         """
@@ -168,28 +259,33 @@ class Requests:
         :param verify: 是否验证 SSL 证书
         :param http2: 是否使用 HTTP/2
         :param proxies: 代理地址
+        :param max_bytes: 响应体最大字节数，默认使用 `ability_max_bytes` 配置
+        :param priority: 请求优先级，`high` 用于交互请求，`low` 用于后台批量任务
+        :param compress: 压缩请求体使用的格式，默认不压缩
         :kwargs: 传递给 `httpx.AsyncClient` 的其他参数
 
         :return: `httpx.Response` 对象
         """
-        async with httpx.AsyncClient(
+        return await cls.request(
+            "PUT",
+            url,
+            content=content,
+            data=data,
+            files=files,
+            json=json,
+            params=params,
+            headers=headers,
+            cookies=cookies,
+            follow_redirects=follow_redirects,
+            timeout=timeout,
             verify=verify,
             http2=http2,
-            proxies=proxies or config.proxy_url,  # type: ignore
+            proxies=proxies,
+            max_bytes=max_bytes,
+            priority=priority,
+            compress=compress,
             **kwargs,
-        ) as client:
-            return await client.put(
-                url,
-                content=content,
-                data=data,
-                files=files,
-                json=json,
-                params=params,
-                headers=add_user_agent(headers),
-                cookies=cookies,
-                follow_redirects=follow_redirects,
-                timeout=timeout if timeout is not None else config.http_timeout,
-            )
+        )
 
     @classmethod
     async def delete(
@@ -204,6 +300,8 @@ class Requests:
         verify: VerifyTypes = True,
         http2: bool = False,
         proxies: ProxiesTypes | None = None,
+        max_bytes: int | None = None,
+        priority: Priority = "normal",
         **kwargs,
     ) -> Response:
         """
@@ -218,24 +316,27 @@ class Requests:
         :param verify: 是否验证 SSL 证书
         :param http2: 是否使用 HTTP/2
         :param proxies: 代理地址
+        :param max_bytes: 响应体最大字节数，默认使用 `ability_max_bytes` 配置
+        :param priority: 请求优先级，`high` 用于交互请求，`low` 用于后台批量任务
         :param kwargs: 传递给 `httpx.AsyncClient` 的其他参数
 
         :return: `httpx.Response` 对象
         """
-        async with httpx.AsyncClient(
+        return await cls.request(
+            "DELETE",
+            url,
+            params=params,
+            headers=headers,
+            cookies=cookies,
+            follow_redirects=follow_redirects,
+            timeout=timeout,
             verify=verify,
             http2=http2,
-            proxies=proxies or config.proxy_url,  # type: ignore
+            proxies=proxies,
+            max_bytes=max_bytes,
+            priority=priority,
             **kwargs,
-        ) as client:
-            return await client.delete(
-                url,
-                params=params,
-                headers=add_user_agent(headers),
-                cookies=cookies,
-                follow_redirects=follow_redirects,
-                timeout=timeout if timeout is not None else config.http_timeout,
-            )
+        )
 
     @classmethod
     async def patch(
@@ -254,6 +355,9 @@ class Requests:
         verify: VerifyTypes = True,
         http2: bool = False,
         proxies: ProxiesTypes | None = None,
+        max_bytes: int | None = None,
+        priority: Priority = "normal",
+        compress: Compression | None = None,
         **kwargs,
     ) -> Response:
         """
@@ -272,28 +376,33 @@ class Requests:
         :param verify: 是否验证 SSL 证书
         :param http2: 是否使用 HTTP/2
         :param proxies: 代理地址
+        :param max_bytes: 响应体最大字节数，默认使用 `ability_max_bytes` 配置
+        :param priority: 请求优先级，`high` 用于交互请求，`low` 用于后台批量任务
+        :param compress: 压缩请求体使用的格式，默认不压缩
         :param kwargs: 传递给 `httpx.AsyncClient` 的其他参数
 
         :return: `httpx.Response` 对象
         """
-        async with httpx.AsyncClient(
+        return await cls.request(
+            "PATCH",
+            url,
+            content=content,
+            data=data,
+            files=files,
+            json=json,
+            params=params,
+            headers=headers,
+            cookies=cookies,
+            follow_redirects=follow_redirects,
+            timeout=timeout,
             verify=verify,
             http2=http2,
-            proxies=proxies or config.proxy_url,  # type: ignore
+            proxies=proxies,
+            max_bytes=max_bytes,
+            priority=priority,
+            compress=compress,
             **kwargs,
-        ) as client:
-            return await client.patch(
-                url,
-                content=content,
-                data=data,
-                files=files,
-                json=json,
-                params=params,
-                headers=add_user_agent(headers),
-                cookies=cookies,
-                follow_redirects=follow_redirects,
-                timeout=timeout if timeout is not None else config.http_timeout,
-            )
+        )
 
     @classmethod
     async def head(
@@ -308,6 +417,10 @@ class Requests:
         verify: VerifyTypes = True,
         http2: bool = False,
         proxies: ProxiesTypes | None = None,
+        max_bytes: int | None = None,
+        priority: Priority = "normal",
+        hedge: bool = False,
+        mirror: URLTypes | None = None,
         **kwargs,
     ) -> Response:
         """
@@ -322,24 +435,31 @@ class Requests:
         :param verify: 是否验证 SSL 证书
         :param http2: 是否使用 HTTP/2
         :param proxies: 代理地址
+        :param max_bytes: 响应体最大字节数，默认使用 `ability_max_bytes` 配置
+        :param priority: 请求优先级，`high` 用于交互请求，`low` 用于后台批量任务
+        :param hedge: 是否启用对冲请求
+        :param mirror: 对冲请求使用的镜像地址，默认与 `url` 相同
         :param kwargs: 传递给 `httpx.AsyncClient` 的其他参数
 
         :return: `httpx.Response` 对象
         """
-        async with httpx.AsyncClient(
+        return await cls.request(
+            "HEAD",
+            url,
+            params=params,
+            headers=headers,
+            cookies=cookies,
+            follow_redirects=follow_redirects,
+            timeout=timeout,
             verify=verify,
             http2=http2,
-            proxies=proxies or config.proxy_url,  # type: ignore
+            proxies=proxies,
+            max_bytes=max_bytes,
+            priority=priority,
+            hedge=hedge,
+            mirror=mirror,
             **kwargs,
-        ) as client:
-            return await client.head(
-                url,
-                params=params,
-                headers=add_user_agent(headers),
-                cookies=cookies,
-                follow_redirects=follow_redirects,
-                timeout=timeout if timeout is not None else config.http_timeout,
-            )
+        )
 
     @classmethod
     async def options(
@@ -354,6 +474,10 @@ class Requests:
         verify: VerifyTypes = True,
         http2: bool = False,
         proxies: ProxiesTypes | None = None,
+        max_bytes: int | None = None,
+        priority: Priority = "normal",
+        hedge: bool = False,
+        mirror: URLTypes | None = None,
         **kwargs,
     ) -> Response:
         """
@@ -368,24 +492,31 @@ class Requests:
         :param verify: 是否验证 SSL 证书
         :param http2: 是否使用 HTTP/2
         :param proxies: 代理地址
+        :param max_bytes: 响应体最大字节数，默认使用 `ability_max_bytes` 配置
+        :param priority: 请求优先级，`high` 用于交互请求，`low` 用于后台批量任务
+        :param hedge: 是否启用对冲请求
+        :param mirror: 对冲请求使用的镜像地址，默认与 `url` 相同
         :param kwargs: 传递给 `httpx.AsyncClient` 的其他参数
 
         :return: `httpx.Response` 对象
         """
-        async with httpx.AsyncClient(
+        return await cls.request(
+            "OPTIONS",
+            url,
+            params=params,
+            headers=headers,
+            cookies=cookies,
+            follow_redirects=follow_redirects,
+            timeout=timeout,
             verify=verify,
             http2=http2,
-            proxies=proxies or config.proxy_url,  # type: ignore
+            proxies=proxies,
+            max_bytes=max_bytes,
+            priority=priority,
+            hedge=hedge,
+            mirror=mirror,
             **kwargs,
-        ) as client:
-            return await client.options(
-                url,
-                params=params,
-                headers=add_user_agent(headers),
-                cookies=cookies,
-                follow_redirects=follow_redirects,
-                timeout=timeout if timeout is not None else config.http_timeout,
-            )
+        )
 
     @classmethod
     async def request(
@@ -405,6 +536,12 @@ class Requests:
         verify: VerifyTypes = True,
         http2: bool = False,
         proxies: ProxiesTypes | None = None,
+        max_bytes: int | None = None,
+        priority: Priority = "normal",
+        compress: Compression | None = None,
+        hedge: bool = False,
+        mirror: URLTypes | None = None,
+        cache: bool = True,
         **kwargs,
     ) -> Response:
         """
@@ -424,17 +561,108 @@ class Requests:
         :param verify: 是否验证 SSL 证书
         :param http2: 是否使用 HTTP/2
         :param proxies: 代理地址
+        :param max_bytes: 响应体最大字节数，默认使用 `ability_max_bytes` 配置
+        :param priority: 请求优先级，`high` 用于交互请求，`low` 用于后台批量任务
+        :param compress: 压缩请求体使用的格式，默认不压缩
+        :param hedge: 是否启用对冲请求，仅支持 GET、HEAD、OPTIONS
+        :param mirror: 对冲请求使用的镜像地址，默认与 `url` 相同
+        :param cache: 是否使用 `Requests.cache` 缓存 GET 响应，携带 Cookie 或认证信息的请求不使用缓存
         :param kwargs: 传递给 `httpx.AsyncClient` 的其他参数
 
+        :raise ResponseTooLargeError: 响应体超出大小限制
+        :raise ValueError: 对非幂等请求启用对冲
         :return: `httpx.Response` 对象
         """
-        async with httpx.AsyncClient(
+        if hedge and method not in HEDGE_METHODS:
+            raise ValueError(f"只能对 {'、'.join(HEDGE_METHODS)} 请求启用对冲: {method}")
+
+        send = partial(
+            cls._send,
+            method,
+            content=content,
+            data=data,
+            files=files,
+            json=json,
+            params=params,
+            headers=headers,
+            cookies=cookies,
+            follow_redirects=follow_redirects,
+            timeout=timeout,
             verify=verify,
             http2=http2,
-            proxies=proxies or config.proxy_url,  # type: ignore
+            proxies=proxies,
+            max_bytes=max_bytes,
+            priority=priority,
+            compress=compress,
+            cache=cache,
             **kwargs,
+        )
+        if not hedge:
+            return await send(url)
+
+        host = httpx.URL(url).host
+        delay = plugin_config.ability_hedge_delay
+        if cls.host_latency.count(host) >= HEDGE_MIN_SAMPLES:
+            delay = cls.host_latency.percentile(
+                host, plugin_config.ability_hedge_percentile
+            )
+        return await hedged(
+            lambda: send(url),
+            lambda: send(mirror if mirror is not None else url),
+            delay,  # type: ignore
+        )
+
+    @classmethod
+    async def _send(
+        cls,
+        method: str,
+        url: URLTypes,
+        *,
+        content: RequestContent | None,
+        data: RequestData | None,
+        files: RequestFiles | None,
+        json: Any,
+        params: QueryParamTypes | None,
+        headers: HeaderTypes | None,
+        cookies: CookieTypes | None,
+        follow_redirects: bool,
+        timeout: TimeoutTypes | None,
+        verify: VerifyTypes,
+        http2: bool,
+        proxies: ProxiesTypes | None,
+        max_bytes: int | None,
+        priority: Priority,
+        compress: Compression | None,
+        cache: bool,
+        **kwargs,
+    ) -> Response:
+        key = entry = None
+        if cache and cls.cache is not None and method == "GET":
+            request_url = httpx.URL(url).copy_merge_params(params or {})
+            headers = httpx.Headers(headers)
+            # 缓存在用户之间共享，携带身份信息的请求不读写缓存
+            if not (
+                cookies
+                or kwargs.get("auth")
+                or "Cookie" in headers
+                or "Authorization" in headers
+            ):
+                key = cache_key(method, str(request_url))
+                try:
+                    entry = await cls.cache.aget(key)
+                except sqlite3.Error as e:
+                    # 缓存不可用时直接请求，本次也不再写入缓存
+                    logger.opt(exception=e).warning("读取响应缓存失败")
+                    key = None
+            if entry is not None:
+                if entry.is_fresh():
+                    return entry.to_response(httpx.Request(method, request_url))
+                headers.update(entry.validators())
+
+        async with cls.scheduler.slot(priority), cls._client(
+            verify, http2, proxies, **kwargs
         ) as client:
-            return await client.request(
+            request = client.build_request(
                 method,
                 url,
                 content=content,
@@ -444,9 +672,143 @@ class Requests:
                 params=params,
                 headers=add_user_agent(headers),
                 cookies=cookies,
-                follow_redirects=follow_redirects,
-                timeout=timeout if timeout is not None else config.http_timeout,
+                timeout=cls._timeout(httpx.URL(url).host, timeout),
+            )
+            if compress is not None:
+                request = await compress_request(request, compress)
+            start = perf_counter()
+            response = await client.send(
+                request, follow_redirects=follow_redirects, stream=True
             )
+            try:
+                await read_limited(
+                    response,
+                    max_bytes
+                    if max_bytes is not None
+                    else plugin_config.ability_max_bytes,
+                )
+            finally:
+                await response.aclose()
+            cls.host_latency.record(request.url.host, perf_counter() - start)
+
+        if key is not None and cls.cache is not None:
+            if response.status_code == 304 and entry is not None:
+                entry = entry.revalidate(response)
+                new_entry = entry if entry.is_shareable() else None
+                response = entry.to_response(response.request)
+            else:
+                new_entry = CacheEntry.from_response(response)
+            try:
+                if new_entry is not None:
+                    await cls.cache.aset(key, new_entry)
+                elif entry is not None:
+                    await cls.cache.adelete(key)
+            except sqlite3.Error as e:
+                logger.opt(exception=e).warning("写入响应缓存失败")
+        return response
+
+    @classmethod
+    @asynccontextmanager
+    async def _client(
+        cls,
+        verify: VerifyTypes,
+        http2: bool,
+        proxies: ProxiesTypes | None,
+        **kwargs,
+    ) -> AsyncGenerator[httpx.AsyncClient, None]:
+        # 只使用通用参数时复用当前事件循环的传输层以保持连接池，否则创建临时客户端
+        transport = kwargs.pop("transport", cls.transport)
+        proxies = proxies or config.proxy_url
+        if (
+            kwargs
+            or not isinstance(verify, bool)
+            or not isinstance(proxies, (str, type(None)))
+        ):
+            async with httpx.AsyncClient(
+                verify=verify,
+                http2=http2,
+                proxies=proxies,  # type: ignore
+                transport=transport,
+                **kwargs,
+            ) as client:
+                yield client
+            return
+
+        transports = cls._transports.setdefault(asyncio.get_running_loop(), {})
+        key = (verify, http2, proxies, transport)
+        if (shared := transports.get(key)) is None:
+            options = {
+                "verify": verify,
+                "http2": http2,
+                # 并发已由 `scheduler` 限制，长时间的流式响应不应占满连接池
+                "limits": httpx.Limits(max_connections=None),
+            }
+            # 与 httpx 一致：自定义传输层时不读取环境变量中的代理
+            mounts = proxy_mounts(proxies, transport is None, **options)
+            if transport is None:
+                transport = httpx.AsyncHTTPTransport(**options)
+            shared = transports[key] = (transport, mounts)
+        # 每次调用使用独立的客户端以隔离 Cookie（含重定向过程中设置的），
+        # 客户端不关闭，关闭会同时关闭共享的传输层
+        yield httpx.AsyncClient(transport=shared[0], mounts=shared[1])
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """关闭各事件循环中复用的传输层，驱动器关闭时自动调用"""
+        for loop, transports in list(cls._transports.items()):
+            await close_clients(
+                loop,
+                [
+                    transport
+                    for default, mounts in transports.values()
+                    for transport in (default, *mounts.values())
+                    if transport is not None
+                ],
+            )
+            transports.clear()
+
+    @classmethod
+    async def prewarm(
+        cls,
+        urls: Iterable[str],
+        *,
+        verify: VerifyTypes = True,
+        http2: bool = False,
+        proxies: ProxiesTypes | None = None,
+    ) -> None:
+        """
+        预先解析并连接主机，连接保留在 `Requests.get` 等方法复用的当前事件循环连接池中
+        参数需与之后的请求一致才能复用连接，连接失败只输出日志。
+
+        :param urls: 主机地址，如 `https://example.com`
+        :param verify: 是否验证 SSL 证书
+        :param http2: 是否使用 HTTP/2
+        :param proxies: 代理地址
+        """
+
+        async def warm(url: str) -> None:
+            try:
+                async with cls._client(verify, http2, proxies) as client:
+                    await client.head(url, headers=add_user_agent())
+            except httpx.HTTPError as e:
+                logger.debug(f"预热连接 {url} 失败: {e!r}")
+
+        await asyncio.gather(*(warm(url) for url in urls))
+
+    @classmethod
+    def _timeout(cls, host: str, timeout: TimeoutTypes | None) -> TimeoutTypes:
+        if timeout is not None:
+            return timeout
+        if (
+            plugin_config.ability_adaptive_timeout
+            and cls.host_latency.count(host) >= HEDGE_MIN_SAMPLES
+        ):
+            p99: float = cls.host_latency.percentile(host, 0.99)  # type: ignore
+            return min(
+                config.http_timeout,
+                max(ADAPTIVE_TIMEOUT_MIN, p99 * ADAPTIVE_TIMEOUT_FACTOR),
+            )
+        return config.http_timeout
 
     @classmethod
     @asynccontextmanager
@@ -467,10 +829,12 @@ class Requests:
         verify: VerifyTypes = True,
         http2: bool = False,
         proxies: ProxiesTypes | None = None,
+        priority: Priority = "normal",
         **kwargs,
     ) -> AsyncGenerator[Response, None]:
         """
         发起流式请求。
+        并发额度只在收到响应头之前占用，长时间读取响应体（如 SSE）不会占满请求并发。
 
         :param method: 请求方法
         :param url: 请求地址
@@ -486,29 +850,256 @@ class Requests:
         :param verify: 是否验证 SSL 证书
         :param http2: 是否使用 HTTP/2
         :param proxies: 代理地址
+        :param priority: 请求优先级，`high` 用于交互请求，`low` 用于后台批量任务
         :param kwargs: 传递给 `httpx.AsyncClient` 的其他参数
 
         :return: `httpx.Response` 对象
         """
-        async with httpx.AsyncClient(
-            verify=verify,
-            http2=http2,
-            proxies=proxies or config.proxy_url,  # type: ignore
-            **kwargs,
-        ) as client, client.stream(
-            method,
-            url,
-            content=content,
-            data=data,
-            files=files,
-            json=json,
-            params=params,
-            headers=add_user_agent(headers),
-            cookies=cookies,
-            follow_redirects=follow_redirects,
-            timeout=timeout if timeout is not None else config.http_timeout,
-        ) as response:
-            yield response
+        async with cls._client(verify, http2, proxies, **kwargs) as client:
+            async with cls.scheduler.slot(priority):
+                request = client.build_request(
+                    method,
+                    url,
+                    content=content,
+                    data=data,
+                    files=files,
+                    json=json,
+                    params=params,
+                    headers=add_user_agent(headers),
+                    cookies=cookies,
+                    timeout=timeout if timeout is not None else config.http_timeout,
+                )
+                response = await client.send(
+                    request, follow_redirects=follow_redirects, stream=True
+                )
+            try:
+                yield response
+            finally:
+                await response.aclose()
+
+    @classmethod
+    @asynccontextmanager
+    async def download(
+        cls,
+        url: URLTypes,
+        *,
+        params: QueryParamTypes | None = None,
+        headers: HeaderTypes | None = None,
+        cookies: CookieTypes | None = None,
+        follow_redirects: bool = True,
+        timeout: TimeoutTypes | None = None,
+        max_bytes: int | None = None,
+        spool_size: int | None = None,
+        **kwargs,
+    ) -> AsyncGenerator[tuple[Response, IO[bytes]], None]:
+        """
+        下载文件，响应体超过 `spool_size` 时写入临时文件而不是保留在内存中。
+        退出上下文后临时文件会被删除。
+
+        :param url: 请求地址
+        :param params: 请求参数
+        :param headers: 请求头
+        :param cookies: 请求 Cookie
+        :param follow_redirects: 是否跟随重定向
+        :param timeout: 超时时间，单位: 秒
+        :param max_bytes: 响应体最大字节数，默认使用 `ability_max_bytes` 配置
+        :param spool_size: 内存中保留的最大字节数，默认使用 `ability_spool_size` 配置
+        :param kwargs: 传递给 `Requests.stream` 的其他参数
+
+        :raise ResponseTooLargeError: 响应体超出大小限制
+        :return: `httpx.Response` 对象与指向响应体开头的文件对象
+        """
+        if max_bytes is None:
+            max_bytes = plugin_config.ability_max_bytes
+        if spool_size is None:
+            spool_size = plugin_config.ability_spool_size
+
+        with tempfile.SpooledTemporaryFile(max_size=spool_size) as file:
+            async with cls.stream(
+                "GET",
+                url,
+                params=params,
+                headers=headers,
+                cookies=cookies,
+                follow_redirects=follow_redirects,
+                timeout=timeout,
+                **kwargs,
+            ) as response:
+                async for chunk in aiter_limited(response, max_bytes):
+                    # 写入磁盘后不再阻塞事件循环
+                    if file._rolled:  # type: ignore
+                        await asyncio.to_thread(file.write, chunk)
+                    else:
+                        file.write(chunk)
+            file.seek(0)
+            yield response, file  # type: ignore
+
+    @overload
+    @classmethod
+    async def get_json(cls, url: URLTypes, *, model: None = None, **kwargs) -> Any:
+        ...
+
+    @overload
+    @classmethod
+    async def get_json(cls, url: URLTypes, *, model: type[T], **kwargs) -> T:
+        ...
+
+    @classmethod
+    async def get_json(
+        cls, url: URLTypes, *, model: type[T] | None = None, **kwargs
+    ) -> T | Any:
+        """
+        发起 GET 请求并解析 JSON 响应。
+
+        :param url: 请求地址
+        :param model: 校验的目标类型（如 pydantic 模型），为 `None` 时直接返回解析结果
+        :param kwargs: 传递给 `Requests.get` 的其他参数
+
+        :raise httpx.HTTPStatusError: 响应状态码错误
+        :return: 解析后的数据
+        """
+        response = await cls.get(url, **kwargs)
+        response.raise_for_status()
+        return await decode_json(response.content, model)
+
+    @overload
+    @classmethod
+    async def post_json(cls, url: URLTypes, *, model: None = None, **kwargs) -> Any:
+        ...
+
+    @overload
+    @classmethod
+    async def post_json(cls, url: URLTypes, *, model: type[T], **kwargs) -> T:
+        ...
+
+    @classmethod
+    async def post_json(
+        cls, url: URLTypes, *, model: type[T] | None = None, **kwargs
+    ) -> T | Any:
+        """
+        发起 POST 请求并解析 JSON 响应。
+
+        :param url: 请求地址
+        :param model: 校验的目标类型（如 pydantic 模型），为 `None` 时直接返回解析结果
+        :param kwargs: 传递给 `Requests.post` 的其他参数
+
+        :raise httpx.HTTPStatusError: 响应状态码错误
+        :return: 解析后的数据
+        """
+        response = await cls.post(url, **kwargs)
+        response.raise_for_status()
+        return await decode_json(response.content, model)
+
+    @classmethod
+    async def sse(
+        cls,
+        method: Literal["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"],
+        url: URLTypes,
+        *,
+        headers: HeaderTypes | None = None,
+        last_event_id: str | None = None,
+        reconnect: bool = False,
+        max_reconnects: int | None = None,
+        retry: float = 3.0,
+        max_event_size: int = 1024 * 1024,
+        **kwargs,
+    ) -> AsyncGenerator[ServerSentEvent, None]:
+        """
+        发起 Server-Sent Events 请求，逐个返回解析后的事件。
+
+        :param method: 请求方法
+        :param url: 请求地址
+        :param headers: 请求头
+        :param last_event_id: 初始的 `Last-Event-ID`，为空时不发送
+        :param reconnect: 连接断开后是否携带 `Last-Event-ID` 自动重连
+        :param max_reconnects: 最大连续重连次数，`None` 为不限制
+        :param retry: 服务端未指定 `retry` 时的重连间隔，单位: 秒
+        :param max_event_size: 单个事件的最大字节数
+        :param kwargs: 传递给 `Requests.stream` 的其他参数
+
+        :raise StreamLimitError: 事件大小超出限制
+        :return: `ServerSentEvent` 异步迭代器
+        """
+        decoder = SSEDecoder(max_event_size)
+        decoder.last_event_id = last_event_id
+        attempts = 0
+        while True:
+            _headers = httpx.Headers(headers)
+            _headers.setdefault("Accept", "text/event-stream")
+            _headers.setdefault("Cache-Control", "no-cache")
+            if decoder.last_event_id:
+                _headers["Last-Event-ID"] = decoder.last_event_id
+
+            error: httpx.TransportError | None = None
+            try:
+                async with cls.stream(
+                    method, url, headers=_headers, **kwargs
+                ) as response:
+                    response.raise_for_status()
+                    if response.status_code == 204:
+                        return
+                    attempts = 0
+                    async for chunk in response.aiter_bytes():
+                        for event in decoder.feed(chunk):
+                            yield event
+                for event in decoder.flush():
+                    yield event
+            except httpx.TransportError as e:
+                decoder.flush()
+                error = e
+
+            if not reconnect or (
+                max_reconnects is not None and attempts >= max_reconnects
+            ):
+                if error is not None:
+                    raise error
+                return
+            attempts += 1
+            await asyncio.sleep(
+                decoder.retry / 1000 if decoder.retry is not None else retry
+            )
+
+    @classmethod
+    async def ndjson(
+        cls,
+        method: Literal["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"],
+        url: URLTypes,
+        *,
+        headers: HeaderTypes | None = None,
+        max_line_size: int = 1024 * 1024,
+        **kwargs,
+    ) -> AsyncGenerator[Any, None]:
+        """
+        发起 NDJSON 流式请求，逐行返回解析后的 JSON 对象。
+
+        :param method: 请求方法
+        :param url: 请求地址
+        :param headers: 请求头
+        :param max_line_size: 单行的最大字节数
+        :param kwargs: 传递给 `Requests.stream` 的其他参数
+
+        :raise StreamLimitError: 单行大小超出限制
+        :return: JSON 对象异步迭代器
+        """
+        _headers = httpx.Headers(headers)
+        _headers.setdefault("Accept", "application/x-ndjson")
+        decoder = NDJSONDecoder(max_line_size)
+        async with cls.stream(method, url, headers=_headers, **kwargs) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                for item in decoder.feed(chunk):
+                    yield item
+        for item in decoder.flush():
+            yield item
+
+    @classmethod
+    def stats(cls) -> dict[str, dict[str, float]]:
+        """
+        获取各优先级请求的延迟统计。
+
+        :return: 各优先级的请求数、总耗时与排队耗时的 p50、p99，单位: 秒
+        """
+        return cls.scheduler.stats()
 
     @classmethod
     @asynccontextmanager
@@ -537,3 +1128,93 @@ class Requests:
             **kwargs,
         ) as client:
             yield client
+
+    @classmethod
+    def session(
+        cls,
+        name: str = "default",
+        *,
+        cookie_file: str | Path | None = None,
+        verify: VerifyTypes = True,
+        http2: bool = False,
+        proxies: ProxiesTypes | None = None,
+        follow_redirects: bool = True,
+        headers: HeaderTypes | None = None,
+        **kwargs,
+    ) -> httpx.AsyncClient:
+        """
+        获取当前事件循环中命名的长期会话，不存在时创建。
+        同名会话复用连接池与 Cookie，并共享 DNS 解析缓存；会话在驱动器关闭时保存 Cookie 并关闭。
+        每个事件循环有各自的客户端，不要把会话传给其他事件循环使用。
+        会话已存在时忽略其他参数。
+
+        :param name: 会话名称
+        :param cookie_file: 保存 Cookie 的文件，默认使用 `ability_session_cookie_dir` 配置
+        :param verify: 是否验证 SSL 证书
+        :param http2: 是否使用 HTTP/2
+        :param proxies: 代理地址
+        :param follow_redirects: 是否跟随重定向
+        :param headers: 会话的默认请求头
+        :param kwargs: 传递给 `httpx.AsyncClient` 的其他参数，`limits`、`cert` 等同样作用于连接池
+        :return: `httpx.AsyncClient` 对象
+        """
+        if name not in cls.sessions:
+            kwargs.setdefault("transport", cls.transport)
+        return cls.sessions.get(
+            name,
+            cookie_file=cookie_file,
+            verify=verify,
+            http2=http2,
+            proxies=proxies or config.proxy_url,
+            follow_redirects=follow_redirects,
+            headers=add_user_agent(headers),
+            **kwargs,
+        )
+
+
+_prewarm_task: asyncio.Task | None = None
+_compact_task: asyncio.Task | None = None
+
+
+async def _compact_cache() -> None:
+    while True:
+        await asyncio.sleep(plugin_config.ability_cache_compact_interval)
+        if Requests.cache is not None:
+            try:
+                await Requests.cache.acompact()
+            except Exception as e:
+                logger.opt(exception=e).warning("整理响应缓存失败")
+
+
+@driver.on_startup
+async def _start_compact_cache() -> None:
+    global _compact_task
+    if Requests.cache is not None:
+        _compact_task = asyncio.create_task(_compact_cache())
+
+
+@driver.on_startup
+async def _start_prewarm() -> None:
+    global _prewarm_task
+    if plugin_config.ability_prewarm_hosts:
+        _prewarm_task = asyncio.create_task(
+            Requests.prewarm(plugin_config.ability_prewarm_hosts)
+        )
+
+
+@driver.on_shutdown
+async def _close_clients_on_shutdown() -> None:
+    await Requests.aclose()
+
+
+@driver.on_shutdown
+async def _close_sessions() -> None:
+    if _prewarm_task is not None:
+        _prewarm_task.cancel()
+    await Requests.sessions.aclose()
+
+
+@driver.on_shutdown
+async def _stop_compact_cache() -> None:
+    if _compact_task is not None:
+        _compact_task.cancel()
@@ -0,0 +1,359 @@
+import time
+import sqlite3
+import asyncio
+
+from pathlib import Path
+from dataclasses import dataclass
+from contextlib import closing
+from email.utils import parsedate_to_datetime
+
+from httpx import Headers, Request, Response
+
+from ..text import md5
+from ..utils import json
+from .utils import json_loads
+
+_SKIP_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+_SHARED_VARY = {"accept-encoding"}
+"""缓存的是解码后的响应体，按这些请求头区分的响应可以共用"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status_code INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    content BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+def cache_key(method: str, url: str) -> str:
+    """
+    获取缓存键
+    :param method: 请求方法
+    :param url: 完整请求地址
+    """
+    return md5(f"{method} {url}")
+
+
+def _parse_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _cache_control(headers: Headers) -> dict[str, str]:
+    directives: dict[str, str] = {}
+    for item in headers.get("Cache-Control", "").split(","):
+        name, _, value = item.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+    return directives
+
+
+def _is_shareable(headers: Headers) -> bool:
+    # 缓存由多个进程与用户共享，不保存私有响应、设置 Cookie 的响应，
+    # 以及按解码后仍有差异的请求头（如 `Cookie`、`User-Agent`）区分的响应
+    directives = _cache_control(headers)
+    vary = {
+        name.strip().lower()
+        for name in headers.get("Vary", "").split(",")
+        if name.strip()
+    }
+    return not (
+        "no-store" in directives
+        or "private" in directives
+        or "Set-Cookie" in headers
+        or vary - _SHARED_VARY
+    )
+
+
+def _freshness_lifetime(response: Response, now: float) -> float:
+    directives = _cache_control(response.headers)
+    if "no-cache" in directives:
+        return 0
+    age = response.headers.get("Age", "")
+    age = int(age) if age.isdigit() else 0
+    # 共享缓存优先使用 `s-maxage`
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name, "").isdigit():
+            return int(directives[name]) - age
+
+    date = _parse_date(response.headers.get("Date")) or now
+    if (expires := _parse_date(response.headers.get("Expires"))) is not None:
+        return expires - date - age
+    if (modified := _parse_date(response.headers.get("Last-Modified"))) is not None:
+        # 没有明确的过期时间时，按 RFC 9111 建议取最后修改时间距今的 10%，最多一天
+        return min((date - modified) / 10, 86400) - age
+    return 0
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    """
+    缓存的响应
+    :param url: 请求地址
+    :param status_code: 状态码
+    :param headers: 响应头
+    :param content: 已解码的响应体
+    :param etag: `ETag` 验证器
+    :param last_modified: `Last-Modified` 验证器
+    :param stored_at: 存储时间戳
+    :param expires_at: 过期时间戳
+    """
+
+    url: str
+    status_code: int
+    headers: list[tuple[str, str]]
+    content: bytes
+    etag: str | None
+    last_modified: str | None
+    stored_at: float
+    expires_at: float
+
+    @classmethod
+    def from_response(cls, response: Response) -> "CacheEntry | None":
+        """
+        从响应创建缓存条目
+        :param response: 已读取响应体的响应
+        :return: 缓存条目，响应不可缓存或不可共享（如 `private`、`Set-Cookie`）时为 `None`
+        """
+        if response.status_code != 200 or not _is_shareable(response.headers):
+            return None
+
+        now = time.time()
+        lifetime = _freshness_lifetime(response, now)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if lifetime <= 0 and etag is None and last_modified is None:
+            return None
+
+        return cls(
+            url=str(response.request.url),
+            status_code=response.status_code,
+            headers=[
+                (name, value)
+                for name, value in response.headers.multi_items()
+                if name not in _SKIP_HEADERS
+            ],
+            content=response.content,
+            etag=etag,
+            last_modified=last_modified,
+            stored_at=now,
+            expires_at=now + max(lifetime, 0),
+        )
+
+    def is_shareable(self) -> bool:
+        """是否可以保存在共享缓存中，验证后的响应头可能不再允许共享"""
+        return _is_shareable(Headers(self.headers))
+
+    def is_fresh(self) -> bool:
+        """是否仍可直接使用，无需向服务器验证"""
+        return time.time() < self.expires_at
+
+    def validators(self) -> dict[str, str]:
+        """条件请求头"""
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def revalidate(self, response: Response) -> "CacheEntry":
+        """
+        使用 `304 Not Modified` 响应刷新缓存条目
+        :param response: 304 响应
+        :return: 刷新后的缓存条目
+        """
+        now = time.time()
+        updated = {name.lower() for name in response.headers}
+        headers = [(k, v) for k, v in self.headers if k.lower() not in updated]
+        headers += [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name not in _SKIP_HEADERS
+        ]
+        lifetime = _freshness_lifetime(Response(200, headers=headers), now)
+        return CacheEntry(
+            url=self.url,
+            status_code=self.status_code,
+            headers=headers,
+            content=self.content,
+            etag=response.headers.get("ETag", self.etag),
+            last_modified=response.headers.get("Last-Modified", self.last_modified),
+            stored_at=now,
+            expires_at=now + max(lifetime, 0),
+        )
+
+    def to_response(self, request: Request) -> Response:
+        """
+        转换为 `httpx.Response` 对象
+        :param request: 对应的请求
+        """
+        return Response(
+            self.status_code,
+            headers=self.headers,
+            content=self.content,
+            request=request,
+            extensions={"from_cache": True},
+        )
+
+
+class SQLiteCache:
+    """
+    基于 SQLite 的持久化响应缓存
+
+    使用 WAL 模式，每次操作使用独立连接，可以被同一主机上的多个进程同时使用。
+    缓存总大小超过 `max_size` 时按最近访问时间淘汰。
+
+    :param path: 数据库文件路径
+    :param max_size: 缓存的最大字节数
+    """
+
+    def __init__(self, path: str | Path, max_size: int = 256 * 1024 * 1024) -> None:
+        self.path = Path(path)
+        self.max_size = max_size
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    def get(self, key: str) -> CacheEntry | None:
+        """
+        读取缓存
+        :param key: 缓存键
+        """
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT url, status_code, headers, content, etag, last_modified,"
+                " stored_at, expires_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+        url, status_code, headers, content, etag, last_modified, *times = row
+        return CacheEntry(
+            url,
+            status_code,
+            [tuple(header) for header in json_loads(headers)],
+            content,
+            etag,
+            last_modified,
+            *times,
+        )
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """
+        写入缓存，并在超出大小限制时淘汰最久未访问的条目
+        :param key: 缓存键
+        :param entry: 缓存条目
+        """
+        if len(entry.content) > self.max_size:
+            return
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.url,
+                    entry.status_code,
+                    json.dumps(entry.headers),
+                    entry.content,
+                    entry.etag,
+                    entry.last_modified,
+                    entry.stored_at,
+                    entry.expires_at,
+                    time.time(),
+                    len(entry.content),
+                ),
+            )
+            self._evict(conn)
+
+    def delete(self, key: str) -> None:
+        """
+        删除缓存
+        :param key: 缓存键
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM responses")
+
+    def size(self) -> int:
+        """缓存的响应体总字节数"""
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+
+    def compact(self) -> None:
+        """删除已过期且无法验证的条目，并回收数据库文件空间"""
+        with closing(self._connect()) as conn:
+            with conn:
+                conn.execute(
+                    "DELETE FROM responses WHERE expires_at < ?"
+                    " AND etag IS NULL AND last_modified IS NULL",
+                    (time.time(),),
+                )
+                self._evict(conn)
+            conn.execute("PRAGMA incremental_vacuum")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[
+            0
+        ]
+        if total <= self.max_size:
+            return
+        excess = total - self.max_size * 0.9
+        freed = 0
+        keys = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ):
+            keys.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM responses WHERE key = ?", keys)
+
+    async def aget(self, key: str) -> CacheEntry | None:
+        """在工作线程中读取缓存"""
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, entry: CacheEntry) -> None:
+        """在工作线程中写入缓存"""
+        await asyncio.to_thread(self.set, key, entry)
+
+    async def adelete(self, key: str) -> None:
+        """在工作线程中删除缓存"""
+        await asyncio.to_thread(self.delete, key)
+
+    async def acompact(self) -> None:
+        """在工作线程中整理缓存"""
+        await asyncio.to_thread(self.compact)
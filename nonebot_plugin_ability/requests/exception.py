@@ -0,0 +1,17 @@
+from nonebot.exception import NoneBotException
+
+
+class RequestsError(NoneBotException):
+    """请求异常"""
+
+
+class StreamLimitError(RequestsError):
+    """流式数据超出大小限制"""
+
+
+class ResponseTooLargeError(RequestsError):
+    """响应体超出大小限制"""
+
+
+class RecordingNotFoundError(RequestsError):
+    """找不到录制的响应"""
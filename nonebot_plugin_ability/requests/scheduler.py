@@ -0,0 +1,152 @@
+import heapq
+import asyncio
+import itertools
+import threading
+
+from time import perf_counter
+from typing import Literal
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+from .stats import LatencyTracker
+
+Priority = Literal["high", "normal", "low"]
+"""请求优先级"""
+
+_RANKS: dict[Priority, int] = {"high": 0, "normal": 1, "low": 2}
+
+
+class _Waiter:
+    __slots__ = ("priority", "future", "granted", "withdrawn")
+
+    def __init__(self, priority: Priority, future: asyncio.Future[None]) -> None:
+        self.priority = priority
+        self.future = future
+        self.granted = False
+        self.withdrawn = False
+
+    def wake(self) -> None:
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class PriorityScheduler:
+    """
+    按优先级分配请求并发额度
+
+    `high` 可以使用全部额度；`normal` 与 `low` 依次少用 `reserve` 比例的额度，
+    因此后台批量请求无论多少，都会为交互请求留出空闲连接。
+    同一优先级内先到先得，空出的额度总是先分配给优先级更高的等待者。
+    可以同时被多个线程中的事件循环使用。
+
+    :param capacity: 最大并发请求数
+    :param reserve: 为更高优先级保留的额度比例
+    """
+
+    def __init__(self, capacity: int = 100, reserve: float = 0.2) -> None:
+        reserved = max(1, int(capacity * reserve)) if capacity > 1 else 0
+        self.capacity = capacity
+        self.limits: dict[Priority, int] = {
+            "high": capacity,
+            "normal": max(1, capacity - reserved),
+            "low": max(1, capacity - 2 * reserved),
+        }
+        self.active = 0
+        self.latency = LatencyTracker()
+        """各优先级从排队到完成的总耗时"""
+        self.wait = LatencyTracker()
+        """各优先级的排队耗时"""
+        self._queue: list[tuple[int, int, _Waiter]] = []
+        self._waiting = [0] * len(_RANKS)
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    async def acquire(self, priority: Priority = "normal") -> None:
+        """
+        获取一个并发额度
+        :param priority: 请求优先级
+        """
+        rank = _RANKS[priority]
+        with self._lock:
+            if self.active < self.limits[priority] and not any(
+                self._waiting[: rank + 1]
+            ):
+                self.active += 1
+                return
+            waiter = _Waiter(priority, asyncio.get_running_loop().create_future())
+            heapq.heappush(self._queue, (rank, next(self._counter), waiter))
+            self._waiting[rank] += 1
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                granted = waiter.granted
+                if not granted:
+                    waiter.withdrawn = True
+                    self._waiting[rank] -= 1
+            if granted:
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """释放一个并发额度"""
+        granted: list[_Waiter] = []
+        with self._lock:
+            self.active -= 1
+            while self._queue:
+                rank, _, waiter = self._queue[0]
+                if waiter.withdrawn:
+                    heapq.heappop(self._queue)
+                    continue
+                if self.active >= self.limits[waiter.priority]:
+                    break
+                heapq.heappop(self._queue)
+                self._waiting[rank] -= 1
+                self.active += 1
+                waiter.granted = True
+                granted.append(waiter)
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        for waiter in granted:
+            loop = waiter.future.get_loop()
+            if loop is running:
+                waiter.wake()
+            else:
+                # 等待者位于其他线程的事件循环（如 `background_loop`）
+                loop.call_soon_threadsafe(waiter.wake)
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = "normal") -> AsyncGenerator[None, None]:
+        """
+        在上下文中占用一个并发额度，并记录排队与总耗时
+        :param priority: 请求优先级
+        """
+        start = perf_counter()
+        await self.acquire(priority)
+        self.wait.record(priority, perf_counter() - start)
+        try:
+            yield
+        finally:
+            self.release()
+            self.latency.record(priority, perf_counter() - start)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """
+        获取各优先级的延迟统计
+        :return: 各优先级的请求数、总耗时与排队耗时的 p50、p99
+        """
+        wait = self.wait.summary()
+        return {
+            priority: {
+                "count": summary["count"],
+                "p50": summary["p50"],
+                "p99": summary["p99"],
+                "wait_p50": wait[priority]["p50"],
+                "wait_p99": wait[priority]["p99"],
+            }
+            for priority, summary in self.latency.summary().items()
+        }
@@ -0,0 +1,295 @@
+import time
+import httpx
+import socket
+import weakref
+import asyncio
+import httpcore
+import ipaddress
+
+from pathlib import Path
+from nonebot.log import logger
+from httpx._types import VerifyTypes
+from collections.abc import Iterable
+from http.cookiejar import LWPCookieJar
+
+from .utils import proxy_mounts
+
+
+class DNSCache:
+    """
+    带过期时间的 DNS 解析缓存
+
+    :param ttl: 解析结果的缓存时间，单位：秒
+    """
+
+    def __init__(self, ttl: float = 300) -> None:
+        self.ttl = ttl
+        self._entries: dict[tuple[str, int], tuple[float, list[str]]] = {}
+
+    async def resolve(self, host: str, port: int) -> list[str]:
+        """
+        解析主机地址，缓存未过期时直接返回
+        :param host: 主机名
+        :param port: 端口
+        :raise httpcore.ConnectError: 解析失败
+        :return: IP 地址列表
+        """
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            pass
+        else:
+            return [host]
+
+        key = (host, port)
+        if (entry := self._entries.get(key)) is not None and entry[
+            0
+        ] > time.monotonic():
+            return entry[1]
+
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(
+                host, port, type=socket.SOCK_STREAM
+            )
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+        addresses = list(dict.fromkeys(str(info[4][0]) for info in infos))
+        self._entries[key] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    def forget(self, host: str, port: int) -> None:
+        """移除主机的解析缓存"""
+        self._entries.pop((host, port), None)
+
+    def clear(self) -> None:
+        """清空解析缓存"""
+        self._entries.clear()
+
+
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """
+    使用 `DNSCache` 解析主机地址的网络后端
+    依次尝试解析到的地址，全部连接失败时移除该主机的缓存。
+
+    :param cache: DNS 解析缓存
+    :param backend: 实际建立连接的网络后端
+    """
+
+    def __init__(self, cache: DNSCache, backend: httpcore.AsyncNetworkBackend) -> None:
+        self.cache = cache
+        self.backend = backend
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: Iterable | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        error: Exception | None = None
+        for address in await self.cache.resolve(host, port):
+            try:
+                return await self.backend.connect_tcp(
+                    address, port, timeout, local_address, socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        self.cache.forget(host, port)
+        raise error or httpcore.ConnectError(f"无法解析主机: {host}")
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: float | None = None,
+        socket_options: Iterable | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        return await self.backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self.backend.sleep(seconds)
+
+
+_TRANSPORT_OPTIONS = ("cert", "http1", "limits", "trust_env")
+"""同时传递给会话传输层的 `httpx.AsyncClient` 参数"""
+
+
+def _install_dns_cache(transport: httpx.AsyncHTTPTransport, cache: DNSCache) -> bool:
+    # httpx 没有提供设置网络后端的参数，只能替换连接池的私有属性 `_network_backend`，
+    # 该属性自 httpcore 0.17 起存在；结构不符时放弃 DNS 缓存而不是报错
+    pool = getattr(transport, "_pool", None)
+    backend = getattr(pool, "_network_backend", None)
+    if not isinstance(pool, httpcore.AsyncConnectionPool) or not isinstance(
+        backend, httpcore.AsyncNetworkBackend
+    ):
+        logger.debug("当前 httpx 版本不支持替换网络后端，会话不使用 DNS 缓存")
+        return False
+    pool._network_backend = CachingNetworkBackend(cache, backend)  # type: ignore
+    return True
+
+
+async def close_clients(
+    loop: asyncio.AbstractEventLoop,
+    clients: list[httpx.AsyncClient] | list[httpx.AsyncBaseTransport],
+) -> None:
+    """
+    在客户端所属的事件循环中关闭客户端
+    事件循环已停止时直接丢弃，其他线程的事件循环最多等待 5 秒。
+
+    :param loop: 客户端所属的事件循环
+    :param clients: 要关闭的客户端或传输层
+    """
+
+    async def close() -> None:
+        await asyncio.gather(
+            *(client.aclose() for client in clients), return_exceptions=True
+        )
+
+    if loop is asyncio.get_running_loop():
+        await close()
+    elif loop.is_running():
+        future = asyncio.run_coroutine_threadsafe(close(), loop)
+        try:
+            await asyncio.wait_for(asyncio.wrap_future(future), 5)
+        except Exception as e:
+            logger.opt(exception=e).warning("关闭其他事件循环中的客户端失败")
+
+
+class SessionPool:
+    """
+    命名的长期会话
+
+    同名会话复用连接池与 Cookie，会话共享 DNS 解析缓存，
+    指定 `cookie_file` 的会话关闭时将 Cookie 保存到文件。
+    连接池绑定事件循环，因此每个事件循环（如 `background_loop`）各有一个同名客户端，
+    它们共用同一个 Cookie。
+
+    :param dns_cache: 会话共享的 DNS 解析缓存
+    :param cookie_dir: 未指定 `cookie_file` 时保存 Cookie 的目录，`None` 为不保存
+    """
+
+    def __init__(self, dns_cache: DNSCache, cookie_dir: Path | None = None) -> None:
+        self.dns_cache = dns_cache
+        self.cookie_dir = cookie_dir
+        self._jars: dict[str, LWPCookieJar] = {}
+        self._clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, httpx.AsyncClient]
+        ] = weakref.WeakKeyDictionary()
+
+    def __contains__(self, name: str) -> bool:
+        """当前事件循环中是否存在未关闭的会话"""
+        clients = self._clients.get(asyncio.get_running_loop(), {})
+        return name in clients and not clients[name].is_closed
+
+    def get(
+        self,
+        name: str,
+        *,
+        cookie_file: str | Path | None = None,
+        verify: VerifyTypes = True,
+        http2: bool = False,
+        transport: httpx.AsyncBaseTransport | None = None,
+        **kwargs,
+    ) -> httpx.AsyncClient:
+        """
+        获取当前事件循环中的会话，不存在或已关闭时创建
+        会话已存在时忽略其他参数；同名会话的 Cookie 只在首次创建时从文件加载。
+
+        :param name: 会话名称
+        :param cookie_file: 保存 Cookie 的文件
+        :param verify: 是否验证 SSL 证书
+        :param http2: 是否使用 HTTP/2
+        :param transport: 自定义传输层，指定时不使用 DNS 解析缓存，也不读取环境变量中的代理
+        :param kwargs: 传递给 `httpx.AsyncClient` 的其他参数，
+            其中 `cert`、`http1`、`limits`、`trust_env` 同时用于创建传输层；
+            未指定 `proxies` 且 `trust_env` 为真时，按 `HTTP(S)_PROXY`、`NO_PROXY`
+            创建代理挂载（同样使用 DNS 解析缓存），与 httpx 默认行为一致
+        :raise RuntimeError: 不在事件循环中调用
+        :return: `httpx.AsyncClient` 对象
+        """
+        clients = self._clients.setdefault(asyncio.get_running_loop(), {})
+        if (client := clients.get(name)) is not None and not client.is_closed:
+            return client
+
+        if (jar := self._jars.get(name)) is None:
+            if cookie_file is None and self.cookie_dir is not None:
+                cookie_file = self.cookie_dir / f"{name}.cookies"
+            jar = self._jars[name] = LWPCookieJar(cookie_file)
+            if cookie_file is not None and Path(cookie_file).is_file():
+                jar.load(ignore_discard=True)
+
+        if transport is None:
+            options = {k: kwargs[k] for k in _TRANSPORT_OPTIONS if k in kwargs}
+            transport = httpx.AsyncHTTPTransport(verify=verify, http2=http2, **options)
+            _install_dns_cache(transport, self.dns_cache)
+            # 传入 `transport` 后 httpx 不再读取环境变量中的代理，在此补上代理挂载
+            if kwargs.get("proxies") is None:
+                mounts = proxy_mounts(
+                    None,
+                    options.pop("trust_env", True),
+                    verify=verify,
+                    http2=http2,
+                    **options,
+                )
+                for mount in mounts.values():
+                    if isinstance(mount, httpx.AsyncHTTPTransport):
+                        _install_dns_cache(mount, self.dns_cache)
+                kwargs["mounts"] = {**mounts, **kwargs.get("mounts", {})}
+        client = clients[name] = httpx.AsyncClient(
+            verify=verify,
+            http2=http2,
+            transport=transport,
+            cookies=jar,
+            **kwargs,
+        )
+        return client
+
+    async def save(self, name: str) -> None:
+        """
+        保存会话的 Cookie，未指定 Cookie 文件时不做任何事
+        :param name: 会话名称
+        """
+        jar = self._jars.get(name)
+        if jar is not None and jar.filename is not None:
+            Path(jar.filename).parent.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(jar.save, ignore_discard=True)
+
+    async def close(self, name: str) -> None:
+        """
+        保存 Cookie 并关闭所有事件循环中的同名会话
+        :param name: 会话名称
+        """
+        await self.save(name)
+        self._jars.pop(name, None)
+        for loop, clients in list(self._clients.items()):
+            if (client := clients.pop(name, None)) is not None:
+                await close_clients(loop, [client])
+
+    async def aclose(self) -> None:
+        """保存 Cookie 并关闭所有会话"""
+        names = set(self._jars)
+        for clients in list(self._clients.values()):
+            names.update(clients)
+        for name in names:
+            try:
+                await self.close(name)
+            except Exception as e:
+                logger.opt(exception=e).warning(f"关闭会话 {name} 失败")
+
+    async def prewarm(self, name: str, urls: Iterable[str]) -> None:
+        """
+        预先解析并连接主机，连接保留在当前事件循环中会话的连接池里
+        连接失败只输出日志。
+
+        :param name: 会话名称
+        :param urls: 主机地址，如 `https://example.com`
+        """
+        client = self.get(name)
+
+        async def warm(url: str) -> None:
+            try:
+                await client.head(url)
+            except httpx.HTTPError as e:
+                logger.debug(f"预热连接 {url} 失败: {e!r}")
+
+        await asyncio.gather(*(warm(url) for url in urls))
@@ -0,0 +1,78 @@
+from collections import deque
+
+
+class LatencyTracker:
+    """
+    滚动延迟统计
+
+    `percentile` 复用排序后的样本，新增样本超过当前样本数的 1/32 后才重新排序，
+    适合对冲、超时等每次请求都要查询分位数的场景。
+
+    :param size: 每个键保留的最近样本数
+    """
+
+    def __init__(self, size: int = 1024) -> None:
+        self.size = size
+        self._samples: dict[str, deque[float]] = {}
+        self._recorded: dict[str, int] = {}
+        self._sorted: dict[str, tuple[int, list[float]]] = {}
+
+    def record(self, key: str, latency: float) -> None:
+        """
+        记录一次延迟
+        :param key: 统计键，如优先级或主机名
+        :param latency: 延迟，单位：秒
+        """
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.size)
+        samples.append(latency)
+        self._recorded[key] = self._recorded.get(key, 0) + 1
+
+    def percentile(self, key: str, q: float) -> float | None:
+        """
+        获取延迟分位数
+        :param key: 统计键
+        :param q: 分位，取值范围 0~1
+        :return: 延迟，没有样本时为 `None`
+        """
+        samples = self._samples.get(key)
+        if not samples:
+            return None
+        recorded = self._recorded[key]
+        cached = self._sorted.get(key)
+        if cached is None or recorded - cached[0] >= max(1, len(samples) >> 5):
+            cached = self._sorted[key] = (recorded, sorted(samples))
+        ordered = cached[1]
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def count(self, key: str) -> int:
+        """
+        获取样本数
+        :param key: 统计键
+        """
+        samples = self._samples.get(key)
+        return len(samples) if samples else 0
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """
+        获取所有键的统计摘要
+        :return: 各键的样本数与 p50、p90、p99 延迟
+        """
+        result: dict[str, dict[str, float]] = {}
+        for key, samples in self._samples.items():
+            ordered = sorted(samples)
+            size = len(ordered)
+            result[key] = {
+                "count": size,
+                "p50": ordered[min(size - 1, int(0.5 * size))],
+                "p90": ordered[min(size - 1, int(0.9 * size))],
+                "p99": ordered[min(size - 1, int(0.99 * size))],
+            }
+        return result
+
+    def clear(self) -> None:
+        """清空所有样本"""
+        self._samples.clear()
+        self._recorded.clear()
+        self._sorted.clear()
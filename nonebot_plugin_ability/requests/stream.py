@@ -0,0 +1,186 @@
+from typing import Any
+from dataclasses import dataclass
+
+from .utils import json_loads
+from .exception import StreamLimitError
+
+_BOM = b"\xef\xbb\xbf"
+
+
+@dataclass(slots=True)
+class ServerSentEvent:
+    """
+    Server-Sent Events 事件
+    :param event: 事件类型
+    :param data: 事件数据，多行数据以 `\\n` 连接
+    :param id: 最后一个事件 ID
+    :param retry: 服务端建议的重连间隔，单位：毫秒
+    """
+
+    event: str = "message"
+    data: str = ""
+    id: str | None = None
+    retry: int | None = None
+
+    def json(self) -> Any:
+        """将事件数据解析为 JSON"""
+        return json_loads(self.data)
+
+
+class SSEDecoder:
+    """
+    Server-Sent Events 增量解析器
+
+    直接处理原始字节块，按 `\\r\\n`、`\\n`、`\\r` 分行，不会在块之间拼接字符串。
+    :param max_event_size: 单个事件（含未完成的行）允许占用的最大字节数
+    """
+
+    def __init__(self, max_event_size: int = 1024 * 1024) -> None:
+        self.max_event_size = max_event_size
+        self.last_event_id: str | None = None
+        self.retry: int | None = None
+        self._buffer = bytearray()
+        self._pending_id: str | None = None
+        self._started = False
+        self._event = ""
+        self._data: list[str] = []
+        self._size = 0
+
+    def feed(self, chunk: bytes) -> list[ServerSentEvent]:
+        """
+        输入一个字节块
+        :param chunk: 原始字节块
+        :raise StreamLimitError: 事件大小超出限制
+        :return: 此次解析出的完整事件
+        """
+        buffer = self._buffer
+        buffer += chunk
+        if not self._started:
+            if len(buffer) < len(_BOM) and _BOM.startswith(buffer):
+                return []
+            if buffer.startswith(_BOM):
+                del buffer[: len(_BOM)]
+            self._started = True
+
+        events: list[ServerSentEvent] = []
+        pos = 0
+        end = len(buffer)
+        while pos < end:
+            lf = buffer.find(b"\n", pos)
+            cr = buffer.find(b"\r", pos, lf if lf != -1 else end)
+            if cr != -1:
+                if cr + 1 == end:
+                    break
+                eol, step = cr, 2 if buffer[cr + 1] == 0x0A else 1
+            elif lf != -1:
+                eol, step = lf, 1
+            else:
+                break
+            event = self._process_line(bytes(buffer[pos:eol]))
+            if event is not None:
+                events.append(event)
+            pos = eol + step
+        del buffer[:pos]
+
+        if self._size + len(buffer) > self.max_event_size:
+            raise StreamLimitError(f"SSE 事件超出大小限制: {self.max_event_size} 字节")
+        return events
+
+    def flush(self) -> list[ServerSentEvent]:
+        """
+        结束输入，丢弃未以空行结尾的事件
+        :return: 缓冲区中剩余的完整事件
+        """
+        events = self.feed(b"\n") if self._buffer.endswith(b"\r") else []
+        self._buffer.clear()
+        self._reset()
+        return events
+
+    def _process_line(self, line: bytes) -> ServerSentEvent | None:
+        if not line:
+            return self._dispatch()
+        if line.startswith(b":"):
+            return None
+
+        field, sep, raw_value = line.partition(b":")
+        if sep and raw_value.startswith(b" "):
+            raw_value = raw_value[1:]
+        value = raw_value.decode("utf-8", errors="replace")
+
+        if field == b"data":
+            self._data.append(value)
+            self._size += len(raw_value) + 1
+        elif field == b"event":
+            self._event = value
+        elif field == b"id":
+            # 事件分发时才更新最后一个事件 ID，连接在事件中途断开时不会跳过该事件；
+            # 空 ID 会重置最后一个事件 ID，重连时不再发送 `Last-Event-ID`
+            if "\0" not in value:
+                self._pending_id = value
+        elif field == b"retry":
+            if value.isascii() and value.isdigit():
+                self.retry = int(value)
+        return None
+
+    def _dispatch(self) -> ServerSentEvent | None:
+        if self._pending_id is not None:
+            self.last_event_id = self._pending_id
+        if not self._data:
+            self._reset()
+            return None
+        event = ServerSentEvent(
+            event=self._event or "message",
+            data="\n".join(self._data),
+            id=self.last_event_id,
+            retry=self.retry,
+        )
+        self._reset()
+        return event
+
+    def _reset(self) -> None:
+        self._pending_id = None
+        self._event = ""
+        self._data = []
+        self._size = 0
+
+
+class NDJSONDecoder:
+    """
+    NDJSON（换行分隔 JSON）增量解析器
+    :param max_line_size: 单行允许的最大字节数
+    """
+
+    def __init__(self, max_line_size: int = 1024 * 1024) -> None:
+        self.max_line_size = max_line_size
+        self._buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """
+        输入一个字节块
+        :param chunk: 原始字节块
+        :raise StreamLimitError: 单行大小超出限制
+        :return: 此次解析出的 JSON 对象
+        """
+        buffer = self._buffer
+        buffer += chunk
+        items: list[Any] = []
+        pos = 0
+        while (eol := buffer.find(b"\n", pos)) != -1:
+            line = bytes(buffer[pos:eol]).strip()
+            if line:
+                items.append(json_loads(line))
+            pos = eol + 1
+        del buffer[:pos]
+
+        if len(buffer) > self.max_line_size:
+            raise StreamLimitError(f"NDJSON 行超出大小限制: {self.max_line_size} 字节")
+        return items
+
+    def flush(self) -> list[Any]:
+        """
+        结束输入，解析缓冲区中最后一行
+        :return: 剩余的 JSON 对象
+        """
+        line = bytes(self._buffer).strip()
+        self._buffer.clear()
+        return [json_loads(line)] if line else []
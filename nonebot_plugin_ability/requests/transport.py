@@ -0,0 +1,112 @@
+import httpx
+import asyncio
+import hashlib
+
+from pathlib import Path
+from collections.abc import AsyncIterator
+
+from ..utils import json
+from .exception import RecordingNotFoundError
+
+
+class _ReplayStream(httpx.AsyncByteStream):
+    def __init__(
+        self, content: bytes, bandwidth: int | None, chunk_size: int = 64 * 1024
+    ) -> None:
+        self.content = content
+        self.bandwidth = bandwidth
+        self.chunk_size = chunk_size
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        view = memoryview(self.content)
+        for start in range(0, len(view), self.chunk_size):
+            chunk = view[start : start + self.chunk_size]
+            if self.bandwidth:
+                await asyncio.sleep(len(chunk) / self.bandwidth)
+            yield bytes(chunk)
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    录制与回放传输层
+
+    将请求的原始响应保存到本地目录，之后相同的请求直接从文件回放，不再访问网络。
+    文件在工作线程中读写，读取过的录制保留在内存中，不影响并发基准测试的结果。
+    可注入固定延迟与带宽限制，用于离线测量 `Requests` 的性能。
+
+    :param path: 录制文件目录
+    :param transport: 录制时实际发送请求的传输层，为 `None` 时只回放
+    :param latency: 每个请求返回响应头前的延迟，单位：秒
+    :param bandwidth: 响应体的传输速度，单位：字节/秒，`None` 为不限制
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        transport: httpx.AsyncBaseTransport | None = None,
+        *,
+        latency: float = 0,
+        bandwidth: int | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.transport = transport
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._recordings: dict[str, tuple[dict, bytes]] = {}
+
+    @staticmethod
+    def key(request: httpx.Request) -> str:
+        """
+        获取请求对应的录制文件名
+        :param request: 已读取请求体的请求
+        """
+        digest = hashlib.md5(f"{request.method} {request.url}".encode())
+        digest.update(request.content)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _load(meta_file: Path, body_file: Path) -> tuple[dict, bytes]:
+        meta = json.loads(meta_file.read_text(encoding="utf-8"))
+        return meta, body_file.read_bytes()
+
+    @staticmethod
+    def _save(meta_file: Path, body_file: Path, meta: dict, content: bytes) -> None:
+        body_file.write_bytes(content)
+        meta_file.write_text(json.dumps(meta), encoding="utf-8")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        key = self.key(request)
+        meta_file = self.path / f"{key}.json"
+        body_file = self.path / f"{key}.body"
+
+        if (recording := self._recordings.get(key)) is not None:
+            meta, content = recording
+        elif await asyncio.to_thread(meta_file.is_file):
+            meta, content = await asyncio.to_thread(self._load, meta_file, body_file)
+        elif self.transport is not None:
+            response = await self.transport.handle_async_request(request)
+            try:
+                content = b"".join([chunk async for chunk in response.stream])  # type: ignore
+            finally:
+                await response.aclose()
+            meta = {
+                "method": request.method,
+                "url": str(request.url),
+                "status_code": response.status_code,
+                "headers": response.headers.multi_items(),
+            }
+            await asyncio.to_thread(self._save, meta_file, body_file, meta, content)
+        else:
+            raise RecordingNotFoundError(f"找不到录制的响应: {request.method} {request.url}")
+        self._recordings[key] = (meta, content)
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return httpx.Response(
+            meta["status_code"],
+            headers=meta["headers"],
+            stream=_ReplayStream(content, self.bandwidth),
+            request=request,
+        )
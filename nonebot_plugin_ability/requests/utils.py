@@ -1,11 +1,59 @@
+import zlib
 import json
+import httpx
+import asyncio
 import secrets
 
 from pathlib import Path
-from typing import Literal
-from collections.abc import Sequence
+from functools import lru_cache
+from typing import Any, Literal, TypeVar, overload
+from collections.abc import (
+    Callable,
+    Iterable,
+    Awaitable,
+    AsyncIterable,
+    AsyncIterator,
+)
 
+from httpx import Response
 from httpx._types import HeaderTypes
+from httpx._utils import get_environment_proxies
+
+from .exception import ResponseTooLargeError
+
+T = TypeVar("T")
+"""模型泛型"""
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from ..utils import json as _json
+
+    json_loads = _json.loads
+
+try:
+    from pydantic import TypeAdapter
+except ImportError:
+    from pydantic import parse_obj_as
+
+    def type_validate(type_: type[T], data: Any) -> T:
+        return parse_obj_as(type_, data)
+
+else:
+    _type_adapter = lru_cache(maxsize=None)(TypeAdapter)
+
+    def type_validate(type_: type[T], data: Any) -> T:
+        return _type_adapter(type_).validate_python(data)
+
+
+JSON_THREAD_THRESHOLD = 256 * 1024
+"""超过该字节数的 JSON 在工作线程中解析"""
+
+COMPRESS_THREAD_THRESHOLD = 256 * 1024
+"""超过该字节数的请求体在工作线程中压缩"""
+
+Compression = Literal["gzip", "deflate"]
+"""请求体压缩格式"""
 
 
 def fake_user_agent(
@@ -25,14 +73,214 @@ def fake_user_agent(
     return {"User-Agent": secrets.choice(fake_data["browsers"][browser])}
 
 
-def add_user_agent(headers: HeaderTypes | None = None) -> HeaderTypes:
+def add_user_agent(headers: HeaderTypes | None = None) -> httpx.Headers:
     """
-    添加随机的 User-Agent 到请求头中
+    添加随机的 User-Agent 到请求头中，已有的 User-Agent 优先
     :param headers: 请求头字典或列表
-    :return: 添加了随机 User-Agent 的请求头字典
+    :return: 添加了随机 User-Agent 的请求头
+    """
+    _headers = httpx.Headers(fake_user_agent())
+    _headers.update(headers)
+    return _headers
+
+
+def proxy_mounts(
+    proxy: str | None = None, trust_env: bool = True, **kwargs
+) -> dict[str, httpx.AsyncBaseTransport | None]:
     """
-    user_agent = fake_user_agent()
-    if headers:
-        _headers = dict(headers) if isinstance(headers, Sequence) else headers
-        return {**user_agent, **_headers}  # type: ignore
-    return user_agent
+    创建代理的传输层挂载，用于传入了 `transport` 的 `httpx.AsyncClient`
+    httpx 在指定 `transport` 时不再读取环境变量中的代理，此处按相同规则补上。
+
+    :param proxy: 代理地址，指定时忽略环境变量
+    :param trust_env: 未指定代理时是否读取 `HTTP(S)_PROXY`、`ALL_PROXY`、`NO_PROXY`
+    :param kwargs: 传递给 `httpx.AsyncHTTPTransport` 的参数
+    :return: `mounts` 参数
+    """
+    if proxy:
+        proxies: dict[str, str | None] = {"all://": proxy}
+    elif trust_env:
+        proxies = get_environment_proxies()
+    else:
+        return {}
+    return {
+        pattern: (
+            None
+            if url is None
+            else httpx.AsyncHTTPTransport(proxy=httpx.Proxy(url), **kwargs)
+        )
+        for pattern, url in proxies.items()
+    }
+
+
+def _compressor(encoding: Compression) -> "zlib._Compress":
+    wbits = zlib.MAX_WBITS | 16 if encoding == "gzip" else zlib.MAX_WBITS
+    return zlib.compressobj(6, zlib.DEFLATED, wbits)
+
+
+def _compress(content: bytes, encoding: Compression) -> bytes:
+    compressor = _compressor(encoding)
+    return compressor.compress(content) + compressor.flush()
+
+
+async def _compress_stream(
+    stream: AsyncIterable[bytes] | Iterable[bytes], encoding: Compression
+) -> AsyncIterator[bytes]:
+    compressor = _compressor(encoding)
+    if isinstance(stream, AsyncIterable):
+        async for chunk in stream:
+            if data := compressor.compress(chunk):
+                yield data
+    else:
+        # 同步请求体，如 `content=iter([...])`
+        for chunk in stream:
+            if data := compressor.compress(chunk):
+                yield data
+    yield compressor.flush()
+
+
+async def compress_request(
+    request: httpx.Request, encoding: Compression
+) -> httpx.Request:
+    """
+    压缩请求体并设置 `Content-Encoding`
+    已知长度的请求体整体压缩并更新 `Content-Length`，流式请求体边读边压缩，以分块编码发送。
+
+    :param request: 请求
+    :param encoding: 压缩格式
+    :return: 压缩后的请求，请求体为空时原样返回
+    """
+    headers = request.headers.copy()
+    headers["Content-Encoding"] = encoding
+    content: bytes | AsyncIterator[bytes]
+    if isinstance(request.stream, httpx.ByteStream):
+        if not request.content:
+            return request
+        if len(request.content) > COMPRESS_THREAD_THRESHOLD:
+            content = await asyncio.to_thread(_compress, request.content, encoding)
+        else:
+            content = _compress(request.content, encoding)
+        headers["Content-Length"] = str(len(content))
+    else:
+        headers.pop("Content-Length", None)
+        content = _compress_stream(request.stream, encoding)  # type: ignore
+    return httpx.Request(
+        request.method,
+        request.url,
+        headers=headers,
+        content=content,
+        extensions=request.extensions,
+    )
+
+
+def _decode_json(content: bytes, model: type[T] | None = None) -> T | Any:
+    data = json_loads(content)
+    return data if model is None else type_validate(model, data)
+
+
+@overload
+async def decode_json(content: bytes, model: None = None) -> Any:
+    ...
+
+
+@overload
+async def decode_json(content: bytes, model: type[T]) -> T:
+    ...
+
+
+async def decode_json(content: bytes, model: type[T] | None = None) -> T | Any:
+    """
+    使用最快的可用 JSON 后端解析数据，并可选地校验为 pydantic 模型
+    超过 `JSON_THREAD_THRESHOLD` 的数据会在工作线程中解析，避免阻塞事件循环。
+
+    :param content: JSON 字节数据
+    :param model: 校验的目标类型，为 `None` 时直接返回解析结果
+    :return: 解析后的数据
+    """
+    if len(content) > JSON_THREAD_THRESHOLD:
+        return await asyncio.to_thread(_decode_json, content, model)
+    return _decode_json(content, model)
+
+
+async def aiter_limited(
+    response: Response, max_bytes: int | None = None
+) -> AsyncIterator[bytes]:
+    """
+    按大小限制迭代已解码的响应体
+    `Content-Length` 超出限制时不读取响应体，直接中止。
+    HEAD 请求与 204、304 响应没有响应体，不检查大小。
+
+    :param response: 流式响应
+    :param max_bytes: 最大字节数，`None` 为不限制
+    :raise ResponseTooLargeError: 响应体超出大小限制
+    """
+    if response.request.method == "HEAD" or response.status_code in (204, 304):
+        max_bytes = None
+    if max_bytes is not None:
+        content_length = response.headers.get("Content-Length", "")
+        if content_length.isdigit() and int(content_length) > max_bytes:
+            raise ResponseTooLargeError(f"响应体大小 {content_length} 超出限制: {max_bytes} 字节")
+
+    total = 0
+    async for chunk in response.aiter_bytes():
+        total += len(chunk)
+        if max_bytes is not None and total > max_bytes:
+            raise ResponseTooLargeError(f"响应体超出大小限制: {max_bytes} 字节")
+        yield chunk
+
+
+async def read_limited(response: Response, max_bytes: int | None = None) -> bytes:
+    """
+    按大小限制读取流式响应的响应体
+    :param response: 流式响应
+    :param max_bytes: 最大字节数，`None` 为不限制
+    :raise ResponseTooLargeError: 响应体超出大小限制
+    :return: 响应体
+    """
+    if max_bytes is None:
+        return await response.aread()
+    content = b"".join([chunk async for chunk in aiter_limited(response, max_bytes)])
+    _set_content(response, content)
+    return content
+
+
+def _set_content(response: Response, content: bytes) -> None:
+    # httpx 0.25 起（至少到 0.28）的 `Response.aread` 将解码后的响应体保存在私有属性 `_content`，
+    # `response.content`、`text`、`json()` 都读取该属性；流已被消费，无法再调用 `aread`
+    response._content = content
+
+
+async def hedged(
+    first: Callable[[], Awaitable[T]],
+    second: Callable[[], Awaitable[T]],
+    delay: float,
+) -> T:
+    """
+    对冲执行：`first` 在 `delay` 秒内未完成或失败时启动 `second`，
+    返回最先成功的结果并取消另一个。
+
+    :param first: 首次尝试
+    :param second: 对冲尝试
+    :param delay: 启动对冲尝试前的等待时间，单位：秒
+    :raise Exception: 所有尝试均失败时抛出最后一个异常
+    :return: 最先成功的结果
+    """
+    pending = {asyncio.ensure_future(first())}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if done and (task := done.pop()).exception() is None:
+            return task.result()
+
+        pending.add(asyncio.ensure_future(second()))
+        while True:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+            if not pending:
+                return done.pop().result()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
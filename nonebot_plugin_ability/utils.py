@@ -1,11 +1,19 @@
+import os
+import stat
+import time
 import yaml
+import atexit
 import inspect
 import asyncio
+import threading
 
+from nonebot import get_driver
 from nonebot.exception import NoneBotException
 from pathlib import Path
 from functools import wraps
-from typing import Any, Callable, TypeVar, ParamSpec, Coroutine
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from collections.abc import Iterable
+from typing import Any, Literal, Callable, TypeVar, ParamSpec, Coroutine
 
 try:
     import ujson as json
@@ -24,6 +32,14 @@ R = TypeVar("R")
 P = ParamSpec("P")
 """参数泛型"""
 
+PathKind = Literal["file", "directory", "missing", "invalid"]
+"""路径类型"""
+
+STAT_CACHE_SIZE = 4096
+"""路径类型缓存的最大条目数"""
+
+_stat_cache: dict[str, tuple[float, PathKind]] = {}
+
 
 class ResourceError(NoneBotException):
     """资源操作异常"""
@@ -105,6 +121,62 @@ def is_file_path(path: str | Path) -> bool:
         return False
 
 
+def _classify_path(path: str, now: float, ttl: float) -> PathKind:
+    cached = _stat_cache.get(path)
+    if cached is not None and now - cached[0] < ttl:
+        return cached[1]
+
+    kind: PathKind
+    if "://" in path:
+        kind = "invalid"
+    else:
+        try:
+            mode = os.stat(path).st_mode
+        except (FileNotFoundError, NotADirectoryError):
+            kind = "missing"
+        except (OSError, ValueError):
+            kind = "invalid"
+        else:
+            if stat.S_ISREG(mode):
+                kind = "file"
+            elif stat.S_ISDIR(mode):
+                kind = "directory"
+            else:
+                kind = "invalid"
+
+    if ttl > 0:
+        if len(_stat_cache) >= STAT_CACHE_SIZE:
+            _stat_cache.clear()
+        _stat_cache[path] = (now, kind)
+    return kind
+
+
+def classify_paths(paths: Iterable[str | Path], *, ttl: float = 1.0) -> list[PathKind]:
+    """
+    批量判断路径类型
+    URL 等包含 `://` 的字符串不会访问文件系统，直接判定为 `invalid`；
+    `ttl` 秒内重复出现的路径复用上一次 `stat` 的结果。
+
+    :param paths: 路径列表
+    :param ttl: 结果缓存时间，单位：秒，为 0 时不使用缓存
+    :return: 与 `paths` 一一对应的路径类型，`file`、`directory`、`missing` 或 `invalid`
+    """
+    now = time.monotonic()
+    return [_classify_path(os.fspath(path), now, ttl) for path in paths]
+
+
+async def aclassify_paths(
+    paths: Iterable[str | Path], *, ttl: float = 1.0
+) -> list[PathKind]:
+    """
+    在工作线程中批量判断路径类型，参见 `classify_paths`
+    :param paths: 路径列表
+    :param ttl: 结果缓存时间，单位：秒，为 0 时不使用缓存
+    :return: 与 `paths` 一一对应的路径类型
+    """
+    return await asyncio.to_thread(classify_paths, list(paths), ttl=ttl)
+
+
 def awaitable(func: Callable[P, R]) -> Callable[P, Coroutine[Any, Any, R]]:
     """同步转异步装饰器"""
 
@@ -113,3 +185,110 @@ def awaitable(func: Callable[P, R]) -> Callable[P, Coroutine[Any, Any, R]]:
         return await asyncio.to_thread(func, *args, **kwargs)
 
     return wrapper
+
+
+class BackgroundLoop:
+    """
+    后台事件循环线程
+
+    供同步代码（如线程中的定时任务、命令行工具）执行协程，
+    事件循环在多次调用之间保持运行，而不是每次都通过 `asyncio.run` 新建，
+    `Requests` 在该循环中复用的客户端与连接池因此也会保持。
+
+    :param name: 线程名称
+    """
+
+    def __init__(self, name: str = "ability-background-loop") -> None:
+        self.name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """后台事件循环，首次访问时启动"""
+        with self._lock:
+            if self._loop is None:
+                ready = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run, args=(ready,), name=self.name, daemon=True
+                )
+                self._thread.start()
+                ready.wait()
+            return self._loop  # type: ignore
+
+    def _run(self, ready: threading.Event) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+
+    def submit(self, coro: Coroutine[Any, Any, R]) -> Future[R]:
+        """
+        提交协程到后台事件循环
+        :param coro: 协程
+        :return: `concurrent.futures.Future` 对象
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, R], timeout: float | None = None) -> R:
+        """
+        在后台事件循环中执行协程并等待结果
+        :param coro: 协程
+        :param timeout: 等待时间，单位：秒
+        :raise RuntimeError: 在后台事件循环线程中调用
+        :return: 协程的返回值
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("不能在后台事件循环中同步等待协程")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def stop(self, timeout: float | None = 5) -> None:
+        """
+        停止后台事件循环，取消未完成的任务
+        :param timeout: 等待线程退出的时间，单位：秒
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+
+
+background_loop = BackgroundLoop()
+"""全局后台事件循环"""
+
+atexit.register(background_loop.stop)
+
+
+@get_driver().on_shutdown
+async def _stop_background_loop() -> None:
+    await asyncio.to_thread(background_loop.stop)
+
+
+def blocking(func: Callable[P, Coroutine[Any, Any, R]]) -> Callable[P, R]:
+    """异步转同步装饰器，在 `background_loop` 中执行"""
+
+    @wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        return background_loop.run(func(*args, **kwargs))
+
+    return wrapper
@@ -0,0 +1,15 @@
+"""
+基准测试
+
+`Requests` 的基准测试分两组：`replay` 回放录制的响应，不经过网络，可注入延迟与带宽；
+`loopback` 访问 127.0.0.1 上的真实替身服务器，包含套接字、连接池与 keep-alive 的开销，
+用于比较连接池与并发相关的改动。
+
+默认以少量迭代作为冒烟测试运行，可通过环境变量调整：
+- `ABILITY_BENCHMARK_ITERATIONS`: 迭代次数
+- `ABILITY_BENCHMARK_LATENCY`: 回放时注入的延迟，单位：秒
+- `ABILITY_BENCHMARK_BANDWIDTH`: 回放时注入的带宽，单位：字节/秒
+- `ABILITY_BENCHMARK_OUTPUT`: 结果输出的 JSON 文件路径
+- `ABILITY_BENCHMARK_BASELINE`: 作为基线的结果文件，p50 变慢的基准测试会被标记为回归
+- `ABILITY_BENCHMARK_THRESHOLD`: 判定回归的变慢比例，默认为 0.2
+"""
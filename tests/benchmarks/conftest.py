@@ -0,0 +1,51 @@
+import os
+import json
+import pytest
+
+from .utils import RESULTS
+
+
+def find_regressions(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> dict[str, tuple[float, float]]:
+    """
+    对比基线，找出 p50 变慢超过 `threshold` 比例的基准测试
+    :return: 基准测试名称与其基线、当前 p50
+    """
+    return {
+        name: (baseline[name]["p50"], result["p50"])
+        for name, result in results.items()
+        if name in baseline and result["p50"] > baseline[name]["p50"] * (1 + threshold)
+    }
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    if not RESULTS:
+        return
+
+    if output := os.environ.get("ABILITY_BENCHMARK_OUTPUT"):
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(RESULTS, file, indent=2, sort_keys=True)
+
+    if baseline_file := os.environ.get("ABILITY_BENCHMARK_BASELINE"):
+        with open(baseline_file, encoding="utf-8") as file:
+            baseline = json.load(file)
+        threshold = float(os.environ.get("ABILITY_BENCHMARK_THRESHOLD", "0.2"))
+        regressions = find_regressions(RESULTS, baseline, threshold)
+
+        reporter = session.config.pluginmanager.get_plugin("terminalreporter")
+        if reporter is not None:
+            reporter.ensure_newline()
+            reporter.section("benchmark regressions")
+            for name, (before, after) in sorted(regressions.items()):
+                reporter.write_line(
+                    f"{name}: p50 {before * 1e6:.1f}us -> {after * 1e6:.1f}us"
+                    f" (+{(after / before - 1) * 100:.0f}%)",
+                    red=True,
+                )
+            if not regressions:
+                reporter.write_line("no regressions", green=True)
+        if regressions:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
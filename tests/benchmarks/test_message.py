@@ -0,0 +1,86 @@
+import pytest
+
+from nonebot.adapters import Message, MessageSegment
+
+from .utils import abench
+
+SEGMENTS = 1000
+
+
+class FakeMessageSegment(MessageSegment["FakeMessage"]):
+    @classmethod
+    def get_message_class(cls) -> type["FakeMessage"]:
+        return FakeMessage
+
+    def __str__(self) -> str:
+        return self.data["text"] if self.is_text() else f"[{self.type}]"
+
+    def is_text(self) -> bool:
+        return self.type == "text"
+
+
+class FakeMessage(Message[FakeMessageSegment]):
+    @classmethod
+    def get_segment_class(cls) -> type[FakeMessageSegment]:
+        return FakeMessageSegment
+
+    @staticmethod
+    def _construct(msg: str):
+        yield FakeMessageSegment("text", {"text": msg})
+
+
+@pytest.fixture
+def unimsg(monkeypatch: pytest.MonkeyPatch):
+    from nonebot_plugin_alconna import At, Text, Image, UniMessage
+
+    from nonebot_plugin_ability import message
+
+    unimsg = UniMessage(
+        [Text("hello "), At("user", "123"), Image(url="https://example.com/a.png")]
+        * (SEGMENTS // 3)
+    )
+
+    async def generate(*args, **kwargs) -> UniMessage:
+        return unimsg
+
+    # 只测量提取逻辑本身，不依赖具体适配器的消息转换
+    monkeypatch.setattr(message.UniMessage, "generate", generate)
+    return unimsg
+
+
+@pytest.mark.asyncio
+async def test_bench_extract_plain_text():
+    from nonebot_plugin_ability.message import extract_plain_text
+
+    short = FakeMessage("  你好  ")
+    long = FakeMessage(
+        [
+            FakeMessageSegment("text", {"text": f"line {i} "})
+            if i % 2
+            else FakeMessageSegment("image", {})
+            for i in range(SEGMENTS)
+        ]
+    )
+    assert await extract_plain_text(short) == "你好"
+
+    await abench("message.extract_plain_text.short", lambda: extract_plain_text(short))
+    await abench(
+        f"message.extract_plain_text.{SEGMENTS}_segments",
+        lambda: extract_plain_text(long),
+    )
+
+
+@pytest.mark.asyncio
+async def test_bench_extract_segments(unimsg):
+    from nonebot_plugin_ability.message import extract_at_users, extract_image_urls
+
+    assert len(await extract_image_urls(None, None)) == SEGMENTS // 3  # type: ignore
+
+    await abench(
+        f"message.extract_image_urls.{SEGMENTS}_segments",
+        lambda: extract_image_urls(None, None),  # type: ignore
+    )
+    await abench(
+        f"message.extract_at_users.{SEGMENTS}_segments",
+        lambda: extract_at_users(None, None),  # type: ignore
+    )
@@ -0,0 +1,204 @@
+import os
+import httpx
+import pytest
+import threading
+import pytest_asyncio
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from .utils import ITERATIONS, abench
+
+LATENCY = float(os.environ.get("ABILITY_BENCHMARK_LATENCY", "0"))
+"""回放时注入的延迟，单位：秒"""
+BANDWIDTH = int(os.environ.get("ABILITY_BENCHMARK_BANDWIDTH", "0")) or None
+"""回放时注入的带宽，单位：字节/秒"""
+
+BASE_URL = "http://bench.local"
+LARGE_BODY = b"x" * 1024 * 1024
+
+
+def stand_in_server(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    if path == "/json":
+        return httpx.Response(200, json={"id": 1, "items": list(range(100))})
+    if path == "/large":
+        return httpx.Response(200, content=LARGE_BODY)
+    if path == "/sse":
+        content = b"".join(b'id: %d\ndata: {"n": %d}\n\n' % (i, i) for i in range(100))
+        return httpx.Response(
+            200, headers={"Content-Type": "text/event-stream"}, content=content
+        )
+    if path == "/ndjson":
+        content = b"".join(b'{"n": %d}\n' % i for i in range(100))
+        return httpx.Response(200, content=content)
+    return httpx.Response(404)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """在 127.0.0.1 上监听的真实替身服务器，支持 keep-alive"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        if self.path == "/json":
+            body = b'{"id": 1, "items": [%s]}' % b", ".join(
+                b"%d" % i for i in range(100)
+            )
+        elif self.path == "/large":
+            body = LARGE_BODY
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+@pytest.fixture(scope="module")
+def loopback_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def loopback(loopback_server, monkeypatch: pytest.MonkeyPatch, driver_config):
+    from nonebot_plugin_ability.requests import Requests
+
+    monkeypatch.setattr(Requests, "transport", None)
+    return loopback_server
+
+
+@pytest_asyncio.fixture
+async def replay(tmp_path, monkeypatch: pytest.MonkeyPatch, driver_config):
+    from nonebot_plugin_ability.requests import Requests
+    from nonebot_plugin_ability.requests.transport import ReplayTransport
+
+    recorder = ReplayTransport(tmp_path, httpx.MockTransport(stand_in_server))
+    async with httpx.AsyncClient(transport=recorder) as client:
+        for path in ("/json", "/large", "/sse", "/ndjson"):
+            await client.get(BASE_URL + path)
+
+    transport = ReplayTransport(tmp_path, latency=LATENCY, bandwidth=BANDWIDTH)
+    monkeypatch.setattr(Requests, "transport", transport)
+    return transport
+
+
+@pytest.mark.asyncio
+async def test_replay_transport(tmp_path):
+    from nonebot_plugin_ability.requests.transport import ReplayTransport
+    from nonebot_plugin_ability.requests.exception import RecordingNotFoundError
+
+    recorder = ReplayTransport(tmp_path, httpx.MockTransport(stand_in_server))
+    async with httpx.AsyncClient(transport=recorder) as client:
+        recorded = await client.get(BASE_URL + "/json")
+
+    async with httpx.AsyncClient(transport=ReplayTransport(tmp_path)) as client:
+        replayed = await client.get(BASE_URL + "/json")
+        assert replayed.json() == recorded.json()
+        with pytest.raises(RecordingNotFoundError):
+            await client.get(BASE_URL + "/missing")
+
+
+@pytest.mark.asyncio
+async def test_bench_get(replay):
+    from nonebot_plugin_ability.requests import Requests
+
+    result = await abench("requests.get", lambda: Requests.get(BASE_URL + "/json"))
+    assert result["count"] == ITERATIONS
+    assert result["p50"] >= LATENCY
+
+
+@pytest.mark.asyncio
+async def test_bench_get_json(replay):
+    from nonebot_plugin_ability.requests import Requests
+
+    await abench("requests.get_json", lambda: Requests.get_json(BASE_URL + "/json"))
+
+
+@pytest.mark.asyncio
+async def test_bench_batch(replay):
+    from nonebot_plugin_ability.requests import Requests
+
+    await abench(
+        "requests.get.batch",
+        lambda: Requests.get(BASE_URL + "/json"),
+        iterations=ITERATIONS * 10,
+        concurrency=50,
+    )
+
+
+@pytest.mark.asyncio
+async def test_bench_stream(replay):
+    from nonebot_plugin_ability.requests import Requests
+
+    async def consume_sse() -> None:
+        events = [event async for event in Requests.sse("GET", BASE_URL + "/sse")]
+        assert len(events) == 100
+
+    async def consume_ndjson() -> None:
+        items = [item async for item in Requests.ndjson("GET", BASE_URL + "/ndjson")]
+        assert len(items) == 100
+
+    await abench("requests.sse", consume_sse)
+    await abench("requests.ndjson", consume_ndjson)
+
+
+@pytest.mark.asyncio
+async def test_bench_download(replay):
+    from nonebot_plugin_ability.requests import Requests
+
+    async def download() -> None:
+        async with Requests.download(BASE_URL + "/large") as (_, file):
+            assert len(file.read()) == len(LARGE_BODY)
+
+    await abench("requests.download", download)
+
+
+@pytest.mark.asyncio
+async def test_bench_loopback_get(loopback):
+    from nonebot_plugin_ability.requests import Requests
+
+    result = await abench(
+        "requests.get.loopback", lambda: Requests.get(loopback + "/json")
+    )
+    assert result["count"] == ITERATIONS
+
+    client = Requests.session("benchmark")
+    try:
+        await abench(
+            "requests.session.get.loopback", lambda: client.get(loopback + "/json")
+        )
+    finally:
+        await Requests.sessions.close("benchmark")
+
+
+@pytest.mark.asyncio
+async def test_bench_loopback_batch(loopback):
+    from nonebot_plugin_ability.requests import Requests
+
+    await abench(
+        "requests.get.batch.loopback",
+        lambda: Requests.get(loopback + "/json"),
+        iterations=ITERATIONS * 10,
+        concurrency=50,
+    )
+
+
+@pytest.mark.asyncio
+async def test_bench_loopback_download(loopback):
+    from nonebot_plugin_ability.requests import Requests
+
+    async def download() -> None:
+        async with Requests.download(loopback + "/large") as (_, file):
+            assert len(file.read()) == len(LARGE_BODY)
+
+    await abench("requests.download.loopback", download)
@@ -0,0 +1,38 @@
+import pytest
+
+from .utils import bench
+
+SHORT_TEXT = "[CQ:at,qq=123] 今天天气不错, 一起去公园吗？"
+LONG_TEXT = (SHORT_TEXT + "\n") * (100 * 1024 // len((SHORT_TEXT + "\n").encode()))
+INDENTED_TEXT = "\n".join(f"    line {i}" for i in range(5000))
+
+
+@pytest.mark.parametrize(("size", "text"), [("short", SHORT_TEXT), ("100k", LONG_TEXT)])
+def test_bench_md5(size: str, text: str):
+    from nonebot_plugin_ability.text import md5
+
+    bench(f"text.md5.{size}", lambda: md5(text))
+
+
+@pytest.mark.parametrize(("size", "text"), [("short", SHORT_TEXT), ("100k", LONG_TEXT)])
+def test_bench_escape(size: str, text: str):
+    from nonebot_plugin_ability.text import escape, unescape
+
+    escaped = escape(text)
+    assert unescape(escaped) == text
+
+    bench(f"text.escape.{size}", lambda: escape(text))
+    bench(f"text.unescape.{size}", lambda: unescape(escaped))
+
+
+def test_bench_indent():
+    from nonebot_plugin_ability.text import indent
+
+    bench("text.indent.5000_lines", lambda: indent(INDENTED_TEXT))
+
+
+def test_bench_random_string():
+    from nonebot_plugin_ability.text import random_string
+
+    bench("text.random_string.32", lambda: random_string(32, type="alphanumeric"))
+    bench("text.random_string.1000x8", lambda: random_string(8, num_strings=1000))
@@ -0,0 +1,71 @@
+import yaml
+import pytest
+
+from pathlib import Path
+
+from .utils import ITERATIONS, bench
+
+ENTRIES = 10000
+
+
+@pytest.fixture(scope="module")
+def data_files(tmp_path_factory: pytest.TempPathFactory) -> dict[str, Path]:
+    from nonebot_plugin_ability.utils import json
+
+    path = tmp_path_factory.mktemp("data")
+    data = {f"key_{i}": {"id": i, "name": f"name {i}"} for i in range(ENTRIES)}
+
+    json_file = path / "data.json"
+    json_file.write_text(json.dumps(data), encoding="utf-8")
+    yaml_file = path / "data.yaml"
+    yaml_file.write_text(yaml.safe_dump(data), encoding="utf-8")
+    toml_file = path / "data.toml"
+    toml_file.write_text(
+        "\n".join(f'[key_{i}]\nid = {i}\nname = "name {i}"\n' for i in range(ENTRIES)),
+        encoding="utf-8",
+    )
+    return {"json": json_file, "yaml": yaml_file, "toml": toml_file}
+
+
+@pytest.mark.parametrize("file_type", ["json", "yaml", "toml"])
+def test_bench_load_data(data_files: dict[str, Path], file_type: str):
+    from nonebot_plugin_ability.utils import load_data
+
+    file = data_files[file_type]
+
+    def load() -> None:
+        assert len(load_data(file)) == ENTRIES
+
+    # yaml 与 toml 为纯 Python 解析，单次即需数秒
+    iterations = ITERATIONS if file_type == "json" else max(1, ITERATIONS // 20)
+    bench(f"utils.load_data.{file_type}.10k", load, iterations)
+
+
+def test_bench_get_path(tmp_path: Path):
+    from nonebot_plugin_ability.utils import get_path
+
+    bench("utils.get_path.relative", lambda: get_path("data.json"))
+    bench("utils.get_path.absolute", lambda: get_path(tmp_path / "data.json"))
+
+
+def test_bench_is_file_path(data_files: dict[str, Path]):
+    from nonebot_plugin_ability.utils import is_file_path
+
+    bench("utils.is_file_path.file", lambda: is_file_path(data_files["json"]))
+    bench("utils.is_file_path.missing", lambda: is_file_path("missing.json"))
+    bench("utils.is_file_path.url", lambda: is_file_path("https://example.com/a.png"))
+
+
+def test_bench_classify_paths(data_files: dict[str, Path]):
+    from nonebot_plugin_ability.utils import is_file_path, classify_paths
+
+    paths = [
+        data_files["json"],
+        data_files["json"].parent,
+        "missing.json",
+        "https://example.com/a.png",
+    ] * 125
+
+    bench("utils.is_file_path.500", lambda: [is_file_path(path) for path in paths])
+    bench("utils.classify_paths.500", lambda: classify_paths(paths, ttl=0))
+    bench("utils.classify_paths.500.cached", lambda: classify_paths(paths))
@@ -0,0 +1,57 @@
+import os
+import time
+import asyncio
+
+from typing import Any
+from collections.abc import Callable, Awaitable
+
+ITERATIONS = int(os.environ.get("ABILITY_BENCHMARK_ITERATIONS", "20"))
+"""每个基准测试的迭代次数"""
+
+RESULTS: dict[str, dict[str, float]] = {}
+"""本次运行的基准测试结果"""
+
+
+def summarize(samples: list[float], elapsed: float) -> dict[str, float]:
+    ordered = sorted(samples)
+    size = len(ordered)
+    return {
+        "count": size,
+        "ops": size / elapsed if elapsed else 0,
+        "p50": ordered[min(size - 1, int(0.5 * size))],
+        "p99": ordered[min(size - 1, int(0.99 * size))],
+    }
+
+
+def bench(
+    name: str, func: Callable[[], Any], iterations: int = ITERATIONS
+) -> dict[str, float]:
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        begin = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - begin)
+    RESULTS[name] = summarize(samples, time.perf_counter() - start)
+    return RESULTS[name]
+
+
+async def abench(
+    name: str,
+    func: Callable[[], Awaitable[Any]],
+    iterations: int = ITERATIONS,
+    concurrency: int = 1,
+) -> dict[str, float]:
+    samples = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run() -> None:
+        async with semaphore:
+            begin = time.perf_counter()
+            await func()
+            samples.append(time.perf_counter() - begin)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run() for _ in range(iterations)))
+    RESULTS[name] = summarize(samples, time.perf_counter() - start)
+    return RESULTS[name]
@@ -0,0 +1,11 @@
+import pytest
+
+
+@pytest.fixture
+def driver_config(monkeypatch: pytest.MonkeyPatch):
+    import nonebot
+
+    config = nonebot.get_driver().config
+    monkeypatch.setattr(config, "proxy_url", None, raising=False)
+    monkeypatch.setattr(config, "http_timeout", 30, raising=False)
+    return config
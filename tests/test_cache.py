@@ -0,0 +1,181 @@
+import httpx
+import pytest
+
+
+def make_response(content: bytes = b"data", **headers: str) -> httpx.Response:
+    return httpx.Response(
+        200,
+        headers=headers,
+        content=content,
+        request=httpx.Request("GET", "http://test/"),
+    )
+
+
+def test_cache_entry():
+    from nonebot_plugin_ability.requests.cache import CacheEntry
+
+    assert CacheEntry.from_response(make_response()) is None
+    assert (
+        CacheEntry.from_response(make_response(**{"Cache-Control": "no-store"})) is None
+    )
+
+    entry = CacheEntry.from_response(make_response(**{"Cache-Control": "max-age=60"}))
+    assert entry is not None
+    assert entry.is_fresh()
+
+    entry = CacheEntry.from_response(make_response(ETag='"v1"'))
+    assert entry is not None
+    assert not entry.is_fresh()
+    assert entry.validators() == {"If-None-Match": '"v1"'}
+
+    not_modified = httpx.Response(304, headers={"Cache-Control": "max-age=60"})
+    entry = entry.revalidate(not_modified)
+    assert entry.is_fresh()
+    assert entry.to_response(httpx.Request("GET", "http://test/")).content == b"data"
+
+
+def test_cache_entry_shareable():
+    from nonebot_plugin_ability.requests.cache import CacheEntry
+
+    def entry(**headers: str):
+        return CacheEntry.from_response(make_response(**headers))
+
+    assert entry(**{"Cache-Control": "private, max-age=60"}) is None
+    assert entry(**{"Cache-Control": "max-age=60", "Set-Cookie": "sid=1"}) is None
+    assert entry(**{"Cache-Control": "max-age=60", "Vary": "Cookie"}) is None
+    assert entry(**{"Cache-Control": "max-age=60", "Vary": "*"}) is None
+    assert entry(**{"Cache-Control": "max-age=60", "Vary": "Accept-Encoding"})
+
+    shared = entry(**{"Cache-Control": "max-age=60, s-maxage=0", "ETag": '"v1"'})
+    assert shared is not None
+    assert not shared.is_fresh()
+    shared = entry(**{"Cache-Control": "max-age=0, s-maxage=60"})
+    assert shared is not None
+    assert shared.is_fresh()
+
+    private = shared.revalidate(
+        httpx.Response(304, headers={"Cache-Control": "private, max-age=60"})
+    )
+    assert not private.is_shareable()
+
+
+def test_sqlite_cache(tmp_path):
+    from nonebot_plugin_ability.requests.cache import CacheEntry, SQLiteCache
+
+    cache = SQLiteCache(tmp_path / "cache.db", max_size=10)
+    entry = CacheEntry.from_response(make_response(b"12345", ETag='"v1"'))
+    assert entry is not None
+
+    cache.set("a", entry)
+    assert cache.get("a") == entry
+    assert SQLiteCache(tmp_path / "cache.db").get("a") == entry
+
+    cache.set("b", entry)
+    cache.set("c", entry)
+    assert cache.get("a") is None
+    assert cache.size() <= 10
+
+    cache.compact()
+    cache.clear()
+    assert cache.size() == 0
+
+
+@pytest.mark.asyncio
+async def test_request_cache(tmp_path, monkeypatch: pytest.MonkeyPatch, driver_config):
+    from nonebot_plugin_ability.requests import Requests
+    from nonebot_plugin_ability.requests.cache import SQLiteCache
+
+    monkeypatch.setattr(Requests, "cache", SQLiteCache(tmp_path / "cache.db"))
+
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"ETag": '"v1"'}, content=b"data")
+
+    transport = httpx.MockTransport(handler)
+    first = await Requests.get("http://test/", transport=transport)
+    second = await Requests.get("http://test/", transport=transport)
+    assert first.content == second.content == b"data"
+    assert second.status_code == 200
+    assert second.extensions["from_cache"] is True
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_request_cache_private(
+    tmp_path, monkeypatch: pytest.MonkeyPatch, driver_config
+):
+    from nonebot_plugin_ability.requests import Requests
+    from nonebot_plugin_ability.requests.cache import SQLiteCache
+
+    monkeypatch.setattr(Requests, "cache", SQLiteCache(tmp_path / "cache.db"))
+
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        cookie = request.headers.get("Cookie", "")
+        if request.url.path == "/private":
+            headers = {"Cache-Control": "private, max-age=600", "Vary": "Cookie"}
+        elif request.url.path == "/login":
+            headers = {"Cache-Control": "max-age=600", "Set-Cookie": "sid=bob"}
+        else:
+            headers = {"Cache-Control": "max-age=600"}
+        return httpx.Response(200, headers=headers, text=f"hello {cookie}")
+
+    transport = httpx.MockTransport(handler)
+
+    await Requests.get(
+        "http://test/private", cookies={"sid": "alice"}, transport=transport
+    )
+    response = await Requests.get("http://test/private", transport=transport)
+    assert response.text == "hello "
+    assert "from_cache" not in response.extensions
+
+    await Requests.get("http://test/", cookies={"sid": "alice"}, transport=transport)
+    await Requests.get(
+        "http://test/", headers={"Cookie": "sid=alice"}, transport=transport
+    )
+    response = await Requests.get("http://test/", transport=transport)
+    assert response.text == "hello "
+    assert "from_cache" not in response.extensions
+    response = await Requests.get("http://test/", transport=transport)
+    assert response.extensions["from_cache"] is True
+
+    await Requests.get("http://test/login", transport=transport)
+    await Requests.get("http://test/login", transport=transport)
+    assert len(requests) == 7
+
+
+@pytest.mark.asyncio
+async def test_request_cache_error(
+    tmp_path, monkeypatch: pytest.MonkeyPatch, driver_config
+):
+    import sqlite3
+
+    from nonebot_plugin_ability.requests import Requests
+    from nonebot_plugin_ability.requests.cache import SQLiteCache
+
+    cache = SQLiteCache(tmp_path / "cache.db")
+    monkeypatch.setattr(Requests, "cache", cache)
+
+    def locked(*args) -> None:
+        raise sqlite3.OperationalError("database is locked")
+
+    transport = httpx.MockTransport(
+        lambda _: httpx.Response(
+            200, headers={"Cache-Control": "max-age=60"}, content=b"data"
+        )
+    )
+
+    monkeypatch.setattr(cache, "set", locked)
+    response = await Requests.get("http://test/", transport=transport)
+    assert response.content == b"data"
+
+    monkeypatch.setattr(cache, "get", locked)
+    response = await Requests.get("http://test/", transport=transport)
+    assert response.content == b"data"
+    assert "from_cache" not in response.extensions
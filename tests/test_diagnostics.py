@@ -0,0 +1,54 @@
+import time
+import pytest
+import asyncio
+
+
+def test_timed():
+    from nonebot_plugin_ability.diagnostics import timed, hot_functions
+
+    @timed
+    def slow() -> str:
+        time.sleep(0.01)
+        return "slow"
+
+    assert slow() == "slow"
+    assert slow() == "slow"
+
+    name, count, total, maximum = next(
+        item for item in hot_functions(100) if item[0].endswith("slow")
+    )
+    assert count == 2
+    assert total >= 0.02
+    assert maximum >= 0.01
+
+
+@pytest.mark.asyncio
+async def test_timed_async():
+    from nonebot_plugin_ability.diagnostics import timed, timings
+
+    @timed
+    async def func() -> int:
+        await asyncio.sleep(0)
+        return 1
+
+    assert await func() == 1
+    assert timings[f"{func.__module__}.{func.__qualname__}"][0] == 1
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor():
+    from nonebot_plugin_ability.diagnostics import LoopMonitor
+
+    monitor = LoopMonitor(interval=0.02, threshold=0.1)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        time.sleep(0.3)
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    assert monitor.stats()["count"] >= 2
+    assert monitor.stats()["p99"] >= 0.2
+    assert len(monitor.stalls) == 1
+    assert "test_loop_monitor" in monitor.stalls[0]
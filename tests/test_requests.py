@@ -0,0 +1,350 @@
+import httpx
+import pytest
+
+from pydantic import BaseModel
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+@pytest.mark.asyncio
+async def test_decode_json():
+    from nonebot_plugin_ability.requests.utils import decode_json
+
+    assert await decode_json(b'{"id": 1, "name": "a"}') == {"id": 1, "name": "a"}
+
+    item = await decode_json(b'{"id": 1, "name": "a"}', Item)
+    assert item == Item(id=1, name="a")
+
+    items = await decode_json(b'[{"id": 1, "name": "a"}]', list[Item])
+    assert items == [Item(id=1, name="a")]
+
+
+@pytest.mark.asyncio
+async def test_decode_json_in_thread(monkeypatch: pytest.MonkeyPatch):
+    from nonebot_plugin_ability.requests import utils
+
+    monkeypatch.setattr(utils, "JSON_THREAD_THRESHOLD", 8)
+    content = b'[{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]'
+    assert await utils.decode_json(content, list[Item]) == [
+        Item(id=1, name="a"),
+        Item(id=2, name="b"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_json(driver_config):
+    from nonebot_plugin_ability.requests import Requests
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/missing":
+            return httpx.Response(404, json={"error": "not found"})
+        if request.method == "POST":
+            return httpx.Response(200, content=request.content)
+        return httpx.Response(200, json=[{"id": 1, "name": "a"}])
+
+    transport = httpx.MockTransport(handler)
+
+    assert await Requests.get_json("http://test/", transport=transport) == [
+        {"id": 1, "name": "a"}
+    ]
+    items = await Requests.get_json(
+        "http://test/", model=list[Item], transport=transport
+    )
+    assert items == [Item(id=1, name="a")]
+    item = await Requests.post_json(
+        "http://test/", json={"id": 2, "name": "b"}, model=Item, transport=transport
+    )
+    assert item == Item(id=2, name="b")
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await Requests.get_json("http://test/missing", transport=transport)
+    with pytest.raises(httpx.HTTPStatusError):
+        await Requests.post_json("http://test/missing", model=Item, transport=transport)
+
+
+@pytest.mark.asyncio
+async def test_max_bytes(driver_config):
+    from nonebot_plugin_ability.requests import Requests
+    from nonebot_plugin_ability.requests.exception import ResponseTooLargeError
+
+    async def chunks():
+        for _ in range(4):
+            yield b"x" * 64
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/chunked":
+            return httpx.Response(200, content=chunks())
+        return httpx.Response(200, content=b"x" * 256)
+
+    transport = httpx.MockTransport(handler)
+
+    response = await Requests.get("http://test/", max_bytes=256, transport=transport)
+    assert response.content == b"x" * 256
+
+    with pytest.raises(ResponseTooLargeError):
+        await Requests.get("http://test/", max_bytes=255, transport=transport)
+    with pytest.raises(ResponseTooLargeError):
+        await Requests.get("http://test/chunked", max_bytes=128, transport=transport)
+
+
+@pytest.mark.asyncio
+async def test_max_bytes_without_body(driver_config):
+    from nonebot_plugin_ability.requests import Requests
+
+    size = str(50 * 1024 * 1024)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status_code = 304 if request.url.path == "/cached" else 200
+        return httpx.Response(status_code, headers={"Content-Length": size})
+
+    transport = httpx.MockTransport(handler)
+
+    response = await Requests.head("http://test/", max_bytes=1000, transport=transport)
+    assert response.headers["Content-Length"] == size
+    response = await Requests.get(
+        "http://test/cached", max_bytes=1000, transport=transport
+    )
+    assert response.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_download(driver_config):
+    from nonebot_plugin_ability.requests import Requests
+
+    transport = httpx.MockTransport(lambda _: httpx.Response(200, content=b"x" * 256))
+    async with Requests.download(
+        "http://test/", spool_size=64, transport=transport
+    ) as (response, file):
+        assert response.status_code == 200
+        assert file._rolled  # type: ignore
+        assert file.read() == b"x" * 256
+
+
+@pytest.mark.asyncio
+async def test_download_rolled_in_thread(
+    driver_config, monkeypatch: pytest.MonkeyPatch
+):
+    import asyncio
+
+    from nonebot_plugin_ability.requests import Requests
+
+    async def chunks():
+        for _ in range(4):
+            yield b"x" * 64
+
+    offloaded = []
+    to_thread = asyncio.to_thread
+
+    async def spy(func, *args, **kwargs):
+        offloaded.append(func)
+        return await to_thread(func, *args, **kwargs)
+
+    monkeypatch.setattr(asyncio, "to_thread", spy)
+    transport = httpx.MockTransport(lambda _: httpx.Response(200, content=chunks()))
+    async with Requests.download(
+        "http://test/", spool_size=100, transport=transport
+    ) as (_, file):
+        assert file.read() == b"x" * 256
+    assert len(offloaded) == 2
+
+
+@pytest.mark.asyncio
+async def test_compress(driver_config):
+    import zlib
+
+    from nonebot_plugin_ability.requests import Requests
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        wbits = (
+            zlib.MAX_WBITS | 16
+            if "gzip" in request.headers.get("Content-Encoding", "")
+            else zlib.MAX_WBITS
+        )
+        content = request.content
+        if "Content-Encoding" in request.headers:
+            content = zlib.decompress(content, wbits)
+        return httpx.Response(
+            200,
+            json={
+                "content": content.decode(),
+                "encoding": request.headers.get("Content-Encoding"),
+                "length": request.headers.get("Content-Length"),
+                "accept": request.headers["Accept-Encoding"],
+            },
+        )
+
+    async def chunks():
+        for _ in range(4):
+            yield b"x" * 64
+
+    transport = httpx.MockTransport(handler)
+
+    response = await Requests.post(
+        "http://test/", content=b"x" * 256, compress="gzip", transport=transport
+    )
+    result = response.json()
+    assert result["content"] == "x" * 256
+    assert result["encoding"] == "gzip"
+    assert int(result["length"]) < 256
+    assert "gzip" in result["accept"]
+
+    response = await Requests.put(
+        "http://test/", content=chunks(), compress="deflate", transport=transport
+    )
+    result = response.json()
+    assert result["content"] == "x" * 256
+    assert result["encoding"] == "deflate"
+    assert result["length"] is None
+
+    response = await Requests.post(
+        "http://test/",
+        content=iter([b"x" * 64] * 4),
+        compress="gzip",
+        transport=transport,
+    )
+    result = response.json()
+    assert result["content"] == "x" * 256
+    assert result["encoding"] == "gzip"
+    assert result["length"] is None
+
+    response = await Requests.post(
+        "http://test/",
+        content=b"x",
+        headers={"Accept-Encoding": "identity"},
+        transport=transport,
+    )
+    result = response.json()
+    assert result["encoding"] is None
+    assert result["accept"] == "identity"
+
+
+@pytest.mark.asyncio
+async def test_hedged():
+    import asyncio
+
+    from nonebot_plugin_ability.requests.utils import hedged
+
+    cancelled = asyncio.Event()
+
+    async def slow() -> str:
+        try:
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "slow"
+
+    async def fast() -> str:
+        return "fast"
+
+    async def fail() -> str:
+        raise RuntimeError
+
+    assert await hedged(fast, slow, 0.01) == "fast"
+    assert await hedged(slow, fast, 0.01) == "fast"
+    assert cancelled.is_set()
+    assert await hedged(slow, fail, 0.01) == "slow"
+    assert await asyncio.wait_for(hedged(fail, fast, 10), 1) == "fast"
+    with pytest.raises(RuntimeError):
+        await hedged(fail, fail, 0.01)
+
+
+def test_latency_tracker():
+    from nonebot_plugin_ability.requests.stats import LatencyTracker
+
+    tracker = LatencyTracker(size=64)
+    assert tracker.percentile("host", 0.5) is None
+    for i in range(64):
+        tracker.record("host", i)
+    assert tracker.percentile("host", 0.5) == 32
+
+    tracker.record("host", 100)
+    assert tracker.percentile("host", 0.99) == 63
+    tracker.record("host", 100)
+    assert tracker.percentile("host", 0.99) == 100
+    assert tracker.summary()["host"]["count"] == 64
+
+
+@pytest.mark.asyncio
+async def test_request_hedge(driver_config):
+    from nonebot_plugin_ability.requests import Requests
+
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, text=request.url.host)
+    )
+    response = await Requests.get(
+        "http://primary/", hedge=True, mirror="http://mirror/", transport=transport
+    )
+    assert response.text == "primary"
+    assert Requests.host_latency.count("primary") >= 1
+
+    with pytest.raises(ValueError):
+        await Requests.request("POST", "http://primary/", hedge=True)
+
+
+@pytest.mark.asyncio
+async def test_shared_client(driver_config):
+    import asyncio
+
+    from nonebot_plugin_ability.utils import BackgroundLoop
+    from nonebot_plugin_ability.requests import Requests
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/login":
+            return httpx.Response(
+                302, headers={"Set-Cookie": "s=1", "Location": "/next"}
+            )
+        return httpx.Response(200, text=request.headers.get("Cookie", ""))
+
+    transport = httpx.MockTransport(handler)
+    response = await Requests.get(
+        "http://test/login", follow_redirects=True, transport=transport
+    )
+    assert response.text == "s=1"
+    response = await Requests.get("http://test/", transport=transport)
+    assert response.text == ""
+    response = await Requests.get(
+        "http://test/", cookies={"sid": "bob"}, transport=transport
+    )
+    assert response.text == "sid=bob"
+
+    loop = asyncio.get_running_loop()
+    assert len(Requests._transports[loop]) == 1
+
+    background = BackgroundLoop()
+    try:
+        await asyncio.wrap_future(
+            background.submit(Requests.get("http://test/", transport=transport))
+        )
+        assert len(Requests._transports[background.loop]) == 1
+
+        await Requests.aclose()
+        assert not Requests._transports[loop]
+        assert not Requests._transports[background.loop]
+    finally:
+        background.stop()
+
+
+@pytest.mark.asyncio
+async def test_shared_transport(driver_config, monkeypatch: pytest.MonkeyPatch):
+    from nonebot_plugin_ability.requests import Requests
+
+    monkeypatch.setenv("HTTP_PROXY", "http://proxy.local:8080")
+    monkeypatch.setenv("NO_PROXY", "example.com")
+    async with Requests._client(True, False, None) as client:
+        transport = client._transport_for_url(httpx.URL("http://test/"))
+        assert transport is not client._transport
+        assert client._transport_for_url(httpx.URL("https://test/")) is (
+            client._transport
+        )
+        assert client._transport_for_url(httpx.URL("http://example.com/")) is (
+            client._transport
+        )
+    async with Requests._client(True, False, None) as other:
+        assert other is not client
+        assert other._transport is client._transport
+        assert other._transport_for_url(httpx.URL("http://test/")) is transport
+    await Requests.aclose()
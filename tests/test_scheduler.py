@@ -0,0 +1,131 @@
+import httpx
+import pytest
+import asyncio
+
+
+@pytest.mark.asyncio
+async def test_priority_scheduler():
+    from nonebot_plugin_ability.requests.scheduler import PriorityScheduler
+
+    scheduler = PriorityScheduler(capacity=4, reserve=0.25)
+    assert scheduler.limits == {"high": 4, "normal": 3, "low": 2}
+
+    order: list[str] = []
+    release = asyncio.Event()
+
+    async def job(name: str, priority) -> None:
+        async with scheduler.slot(priority):
+            order.append(name)
+            await release.wait()
+
+    tasks = [asyncio.create_task(job(f"low{i}", "low")) for i in range(4)]
+    await asyncio.sleep(0)
+    assert order == ["low0", "low1"]
+
+    tasks.append(asyncio.create_task(job("normal", "normal")))
+    tasks.append(asyncio.create_task(job("high", "high")))
+    await asyncio.sleep(0)
+    assert order == ["low0", "low1", "normal", "high"]
+    assert scheduler.active == 4
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert order[4:] == ["low2", "low3"]
+    assert scheduler.active == 0
+    assert scheduler.stats()["low"]["count"] == 4
+
+
+@pytest.mark.asyncio
+async def test_priority_scheduler_cancel():
+    from nonebot_plugin_ability.requests.scheduler import PriorityScheduler
+
+    scheduler = PriorityScheduler(capacity=1)
+    await scheduler.acquire("high")
+
+    waiter = asyncio.create_task(scheduler.acquire("high"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    scheduler.release()
+    await asyncio.wait_for(scheduler.acquire("low"), 1)
+    assert scheduler.active == 1
+
+
+@pytest.mark.asyncio
+async def test_priority_scheduler_across_loops():
+    from nonebot_plugin_ability.utils import BackgroundLoop
+    from nonebot_plugin_ability.requests.scheduler import PriorityScheduler
+
+    scheduler = PriorityScheduler(capacity=1)
+    background = BackgroundLoop()
+    await scheduler.acquire("high")
+    try:
+        future = background.submit(scheduler.acquire("low"))
+        await asyncio.sleep(0.05)
+        assert not future.done()
+
+        scheduler.release()
+        await asyncio.wrap_future(future)
+        assert scheduler.active == 1
+    finally:
+        background.stop()
+
+
+@pytest.mark.asyncio
+async def test_high_priority_during_bulk(
+    driver_config, monkeypatch: pytest.MonkeyPatch
+):
+    from nonebot_plugin_ability.requests import Requests
+    from nonebot_plugin_ability.requests.scheduler import PriorityScheduler
+
+    monkeypatch.setattr(Requests, "scheduler", PriorityScheduler(4, 0.25))
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.02)
+        return httpx.Response(200)
+
+    transport = httpx.MockTransport(handler)
+    bulk = asyncio.gather(
+        *(
+            Requests.get("http://test/", priority="low", transport=transport)
+            for _ in range(40)
+        )
+    )
+    await asyncio.sleep(0.05)
+    for _ in range(10):
+        await Requests.get("http://test/", priority="high", transport=transport)
+    await bulk
+
+    stats = Requests.stats()
+    assert stats["low"]["count"] == 40
+    assert stats["high"]["count"] == 10
+    assert stats["high"]["wait_p99"] < 0.01
+    assert stats["high"]["p99"] < stats["low"]["p99"] / 2
+
+
+@pytest.mark.asyncio
+async def test_stream_releases_slot(driver_config, monkeypatch: pytest.MonkeyPatch):
+    from nonebot_plugin_ability.requests import Requests
+    from nonebot_plugin_ability.requests.scheduler import PriorityScheduler
+
+    monkeypatch.setattr(Requests, "scheduler", PriorityScheduler(1))
+
+    async def chunks():
+        yield b"data: 1\n\n"
+        await asyncio.sleep(0.05)
+        yield b"data: 2\n\n"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/sse":
+            return httpx.Response(200, content=chunks())
+        return httpx.Response(200)
+
+    transport = httpx.MockTransport(handler)
+    async for event in Requests.sse("GET", "http://test/sse", transport=transport):
+        assert Requests.scheduler.active == 0
+        response = await asyncio.wait_for(
+            Requests.get("http://test/", transport=transport), 1
+        )
+        assert response.status_code == 200
@@ -0,0 +1,209 @@
+import httpx
+import pytest
+import asyncio
+
+
+@pytest.mark.asyncio
+async def test_dns_cache(monkeypatch: pytest.MonkeyPatch):
+    import socket
+
+    from nonebot_plugin_ability.requests.session import DNSCache
+
+    calls = []
+
+    async def getaddrinfo(host, port, **kwargs):
+        calls.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", port))]
+
+    loop = asyncio.get_running_loop()
+    monkeypatch.setattr(loop, "getaddrinfo", getaddrinfo)
+
+    cache = DNSCache(ttl=60)
+    assert await cache.resolve("example.com", 443) == ["10.0.0.1"]
+    assert await cache.resolve("example.com", 443) == ["10.0.0.1"]
+    assert await cache.resolve("127.0.0.1", 443) == ["127.0.0.1"]
+    assert calls == ["example.com"]
+
+    cache.forget("example.com", 443)
+    await cache.resolve("example.com", 443)
+    assert len(calls) == 2
+
+    cache.ttl = 0
+    cache.clear()
+    await cache.resolve("example.com", 443)
+    await cache.resolve("example.com", 443)
+    assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_caching_network_backend():
+    import httpcore
+
+    from nonebot_plugin_ability.requests.session import DNSCache, CachingNetworkBackend
+
+    attempts = []
+
+    class Backend(httpcore.AsyncNetworkBackend):
+        async def connect_tcp(self, host, port, *args, **kwargs):
+            attempts.append(host)
+            if host == "10.0.0.1":
+                raise httpcore.ConnectError
+            return host  # type: ignore
+
+    cache = DNSCache()
+    cache._entries[("example.com", 80)] = (float("inf"), ["10.0.0.1", "10.0.0.2"])
+    backend = CachingNetworkBackend(cache, Backend())
+    assert await backend.connect_tcp("example.com", 80) == "10.0.0.2"
+    assert attempts == ["10.0.0.1", "10.0.0.2"]
+
+    cache._entries[("example.com", 80)] = (float("inf"), ["10.0.0.1"])
+    with pytest.raises(httpcore.ConnectError):
+        await backend.connect_tcp("example.com", 80)
+    assert ("example.com", 80) not in cache._entries
+
+
+@pytest.mark.asyncio
+async def test_session(tmp_path, driver_config):
+    from nonebot_plugin_ability.requests import Requests
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/login":
+            return httpx.Response(200, headers={"Set-Cookie": "token=abc; Path=/"})
+        return httpx.Response(200, text=request.headers.get("Cookie", ""))
+
+    transport = httpx.MockTransport(handler)
+    cookie_file = tmp_path / "cookies" / "test.cookies"
+
+    client = Requests.session("test", cookie_file=cookie_file, transport=transport)
+    assert Requests.session("test") is client
+    await client.get("https://example.com/login")
+    assert (await client.get("https://example.com/")).text == "token=abc"
+
+    await Requests.sessions.close("test")
+    assert client.is_closed
+    assert cookie_file.is_file()
+
+    client = Requests.session("test", cookie_file=cookie_file, transport=transport)
+    assert (await client.get("https://example.com/")).text == "token=abc"
+    await Requests.sessions.aclose()
+    assert "test" not in Requests.sessions
+
+
+@pytest.fixture
+def local_server():
+    import threading
+
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            body = self.headers.get("Cookie", "").encode()
+            self.send_response(200)
+            if self.path == "/login":
+                self.send_header("Set-Cookie", "token=abc; Path=/")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_HEAD(self) -> None:
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_session_across_loops(local_server, driver_config):
+    from nonebot_plugin_ability.utils import BackgroundLoop
+    from nonebot_plugin_ability.requests import Requests
+
+    client = Requests.session("loops")
+    await client.get(local_server + "/login")
+
+    async def use_session() -> tuple[httpx.AsyncClient, str]:
+        other = Requests.session("loops")
+        response = await other.get(local_server + "/")
+        return other, response.text
+
+    background = BackgroundLoop()
+    try:
+        other, text = await asyncio.wrap_future(background.submit(use_session()))
+        assert other is not client
+        assert text == "token=abc"
+        assert (await client.get(local_server + "/")).text == "token=abc"
+
+        await Requests.sessions.close("loops")
+        assert client.is_closed
+        assert other.is_closed
+    finally:
+        background.stop()
+
+
+@pytest.mark.asyncio
+async def test_session_transport_options(driver_config):
+    from nonebot_plugin_ability.requests import Requests
+    from nonebot_plugin_ability.requests.session import CachingNetworkBackend
+
+    client = Requests.session("options", limits=httpx.Limits(max_connections=1))
+    try:
+        pool = client._transport._pool  # type: ignore
+        assert pool._max_connections == 1
+        assert isinstance(pool._network_backend, CachingNetworkBackend)
+    finally:
+        await Requests.sessions.close("options")
+
+
+@pytest.mark.asyncio
+async def test_session_env_proxy(driver_config, monkeypatch: pytest.MonkeyPatch):
+    from nonebot_plugin_ability.requests import Requests
+    from nonebot_plugin_ability.requests.session import CachingNetworkBackend
+
+    monkeypatch.setenv("HTTP_PROXY", "http://proxy.local:8080")
+    monkeypatch.setenv("NO_PROXY", "example.com")
+    client = Requests.session("proxy")
+    other = Requests.session("no-proxy", trust_env=False)
+    try:
+        proxy = client._transport_for_url(httpx.URL("http://test/"))
+        assert proxy is not client._transport
+        assert isinstance(
+            proxy._pool._network_backend, CachingNetworkBackend  # type: ignore
+        )
+        assert client._transport_for_url(httpx.URL("http://example.com/")) is (
+            client._transport
+        )
+        assert other._transport_for_url(httpx.URL("http://test/")) is (other._transport)
+    finally:
+        await Requests.sessions.close("proxy")
+        await Requests.sessions.close("no-proxy")
+
+
+@pytest.mark.asyncio
+async def test_prewarm(local_server, driver_config, monkeypatch: pytest.MonkeyPatch):
+    from nonebot_plugin_ability.config import plugin_config
+    from nonebot_plugin_ability import requests
+    from nonebot_plugin_ability.requests import Requests
+
+    monkeypatch.setattr(plugin_config, "ability_prewarm_hosts", [local_server])
+    await requests._start_prewarm()
+    assert requests._prewarm_task is not None
+    await requests._prewarm_task
+    assert "default" not in Requests.sessions
+
+    transport, _ = Requests._transports[asyncio.get_running_loop()][
+        (True, False, None, None)
+    ]
+    pool = transport._pool  # type: ignore
+    assert len(pool.connections) == 1
+    await Requests.get(local_server + "/")
+    assert len(pool.connections) == 1
+    await Requests.aclose()
@@ -0,0 +1,180 @@
+import httpx
+import pytest
+
+
+def test_sse_decoder():
+    from nonebot_plugin_ability.requests.stream import SSEDecoder
+
+    decoder = SSEDecoder()
+    chunks = [
+        b"\xef\xbb\xbf: comment\r\n",
+        b"event: update\r\nid: 1\r\nretry: 1500\r\nda",
+        b'ta: {"a": 1}\r',
+        b"\n\r\n",
+        b"data: line 1\ndata: line 2\n\n",
+        b"data:no space\r\rdata: tail",
+    ]
+    events = [event for chunk in chunks for event in decoder.feed(chunk)]
+    events += decoder.flush()
+
+    assert len(events) == 3
+    assert events[0].event == "update"
+    assert events[0].id == "1"
+    assert events[0].retry == 1500
+    assert events[0].json() == {"a": 1}
+    assert events[1].event == "message"
+    assert events[1].data == "line 1\nline 2"
+    assert events[1].id == "1"
+    assert events[2].data == "no space"
+    assert decoder.last_event_id == "1"
+
+
+def test_sse_decoder_pending_id():
+    from nonebot_plugin_ability.requests.stream import SSEDecoder
+
+    decoder = SSEDecoder()
+    events = decoder.feed(b"id: 1\ndata: a\n\nid: 2\ndata: part")
+    assert [event.id for event in events] == ["1"]
+    assert decoder.flush() == []
+    assert decoder.last_event_id == "1"
+
+    assert decoder.feed(b"id: 3\n\nretry: \xc2\xb2\n") == []
+    assert decoder.last_event_id == "3"
+    assert decoder.retry is None
+
+
+def test_sse_decoder_limit():
+    from nonebot_plugin_ability.requests.stream import SSEDecoder
+    from nonebot_plugin_ability.requests.exception import StreamLimitError
+
+    decoder = SSEDecoder(max_event_size=16)
+    with pytest.raises(StreamLimitError):
+        decoder.feed(b"data: " + b"x" * 32)
+
+
+def test_ndjson_decoder():
+    from nonebot_plugin_ability.requests.stream import NDJSONDecoder
+
+    decoder = NDJSONDecoder()
+    assert decoder.feed(b'{"a": 1}\n{"b"') == [{"a": 1}]
+    assert decoder.feed(b": 2}\r\n\n[3]") == [{"b": 2}]
+    assert decoder.flush() == [[3]]
+
+
+def test_ndjson_decoder_limit():
+    from nonebot_plugin_ability.requests.stream import NDJSONDecoder
+    from nonebot_plugin_ability.requests.exception import StreamLimitError
+
+    decoder = NDJSONDecoder(max_line_size=8)
+    with pytest.raises(StreamLimitError):
+        decoder.feed(b'{"key": "value"}')
+
+
+@pytest.mark.asyncio
+async def test_sse_reconnect(driver_config):
+    from nonebot_plugin_ability.requests import Requests
+
+    seen: list[str | None] = []
+
+    async def broken(events: bytes):
+        yield events
+        raise httpx.ReadError("connection lost")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("Last-Event-ID"))
+        if len(seen) == 1:
+            return httpx.Response(200, content=broken(b"retry: 0\nid: 1\ndata: a\n\n"))
+        if len(seen) == 2:
+            return httpx.Response(200, content=broken(b"id:\ndata: b\n\n"))
+        if len(seen) == 3:
+            return httpx.Response(200, content=b"id: 3\ndata: c\n\n")
+        return httpx.Response(204)
+
+    transport = httpx.MockTransport(handler)
+    events = [
+        event
+        async for event in Requests.sse(
+            "GET", "http://test/", reconnect=True, transport=transport
+        )
+    ]
+    assert [event.data for event in events] == ["a", "b", "c"]
+    assert [event.id for event in events] == ["1", "", "3"]
+    assert seen == [None, "1", None, "3"]
+
+
+@pytest.mark.asyncio
+async def test_sse_reconnect_mid_event(driver_config):
+    from nonebot_plugin_ability.requests import Requests
+
+    seen: list[str | None] = []
+
+    async def broken():
+        yield b"retry: 0\nid: 1\ndata: a\n\nid: 2\ndata: part"
+        raise httpx.ReadError("connection lost")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("Last-Event-ID"))
+        if len(seen) == 1:
+            return httpx.Response(200, content=broken())
+        if len(seen) == 2:
+            return httpx.Response(200, content=b"id: 2\ndata: b\n\n")
+        return httpx.Response(204)
+
+    transport = httpx.MockTransport(handler)
+    events = [
+        event
+        async for event in Requests.sse(
+            "GET", "http://test/", reconnect=True, transport=transport
+        )
+    ]
+    assert [event.data for event in events] == ["a", "b"]
+    assert seen == [None, "1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_sse_max_reconnects(driver_config):
+    from nonebot_plugin_ability.requests import Requests
+
+    attempts = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal attempts
+        attempts += 1
+        raise httpx.ConnectError("refused", request=request)
+
+    transport = httpx.MockTransport(handler)
+    with pytest.raises(httpx.ConnectError):
+        async for _ in Requests.sse(
+            "GET",
+            "http://test/",
+            reconnect=True,
+            max_reconnects=2,
+            retry=0,
+            transport=transport,
+        ):
+            pass
+    assert attempts == 3
+
+    attempts = 0
+    with pytest.raises(httpx.ConnectError):
+        async for _ in Requests.sse("GET", "http://test/", transport=transport):
+            pass
+    assert attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_ndjson(driver_config):
+    from nonebot_plugin_ability.requests import Requests
+
+    async def chunks():
+        yield b'{"n": 1}\n{"n"'
+        yield b': 2}\n{"n": 3}'
+
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, content=chunks())
+    )
+    items = [
+        item
+        async for item in Requests.ndjson("GET", "http://test/", transport=transport)
+    ]
+    assert items == [{"n": 1}, {"n": 2}, {"n": 3}]
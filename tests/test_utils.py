@@ -48,3 +48,65 @@ async def test_awaitable():
 
     result = await sync_func()
     assert result == "test"
+
+
+def test_background_loop():
+    import asyncio
+
+    from nonebot_plugin_ability.utils import BackgroundLoop
+
+    background = BackgroundLoop()
+
+    async def current_loop() -> asyncio.AbstractEventLoop:
+        await asyncio.sleep(0)
+        return asyncio.get_running_loop()
+
+    try:
+        first = background.run(current_loop())
+        assert background.run(current_loop()) is first
+        assert background.submit(current_loop()).result(1) is first
+    finally:
+        background.stop()
+    assert first.is_closed()
+
+
+@pytest.mark.asyncio
+async def test_blocking():
+    import asyncio
+
+    from nonebot_plugin_ability.utils import blocking
+
+    @blocking
+    async def async_func() -> Any:
+        await asyncio.sleep(0)
+        return "test"
+
+    result = await asyncio.to_thread(async_func)
+    assert result == "test"
+
+
+def test_classify_paths(temp_file, tmp_path):
+    from nonebot_plugin_ability.utils import classify_paths
+
+    paths = [
+        temp_file,
+        str(tmp_path),
+        tmp_path / "missing.txt",
+        temp_file / "child",
+        "https://example.com/a.png",
+        "bad\0path",
+    ]
+    expected = ["file", "directory", "missing", "missing", "invalid", "invalid"]
+    assert classify_paths(paths) == expected
+
+    temp_file.unlink()
+    assert classify_paths([temp_file]) == ["file"]
+    assert classify_paths([temp_file], ttl=0) == ["missing"]
+
+
+@pytest.mark.asyncio
+async def test_aclassify_paths(temp_file, tmp_path):
+    from nonebot_plugin_ability.utils import aclassify_paths
+
+    result = await aclassify_paths([temp_file, tmp_path, tmp_path / "missing"], ttl=0)
+    assert result == ["file", "directory", "missing"]